@@ -4,6 +4,7 @@ from app.steps.step_3_get_audio_transcription import audio_to_text
 from app.steps.step_4_get_video_analysis import generate_description_from_video
 from src.modules.notWorthyResponse import not_worthy_response
 from app.steps.step_6_if_worthy_response import if_worthy_response
+import asyncio
 import json
 
 async def check_authenticity(url: str, log: bool = False):
@@ -30,7 +31,7 @@ async def check_authenticity(url: str, log: bool = False):
     # save the video and audio locally
     if log:
         print("Saving video and audio locally")
-    video_and_audio = save_video_and_audio_locally(link['videoUrl'], link['filename'], log)
+    video_and_audio = await save_video_and_audio_locally(link['videoUrl'], link['filename'], log)
     if log:
         results['video_and_audio'] = video_and_audio
         if video_and_audio.get('success'):
@@ -46,7 +47,7 @@ async def check_authenticity(url: str, log: bool = False):
     # get the transcription of the audio
     if log:
         print("Getting transcription of audio")
-    transcription = audio_to_text(video_and_audio['audio'])
+    transcription = await audio_to_text(video_and_audio['audio'])
     if log:
         results['transcription'] = transcription
         if transcription:
@@ -63,7 +64,7 @@ async def check_authenticity(url: str, log: bool = False):
     # get the analysis of the video
     if log:
         print("Getting analysis of video")
-    description = generate_description_from_video(video_and_audio['video'], transcription)
+    description = await asyncio.to_thread(generate_description_from_video, video_and_audio['video'], transcription)
     if log:
         results['description'] = description
         if description.get('success'):
@@ -125,7 +126,7 @@ async def check_authenticity_websocket(websocket, url: str):
         # save the video and audio locally
         await websocket.send_text(json.dumps({"step": "saving_media", "message": "Saving video and audio locally"}))
         
-        video_and_audio = save_video_and_audio_locally(link['videoUrl'], link['filename'], False)
+        video_and_audio = await save_video_and_audio_locally(link['videoUrl'], link['filename'], False)
         
         if video_and_audio['success']:
             await websocket.send_text(json.dumps({"step": "media_saved", "message": "Video and audio saved locally"}))
@@ -141,7 +142,7 @@ async def check_authenticity_websocket(websocket, url: str):
         # get the transcription of the audio
         await websocket.send_text(json.dumps({"step": "transcribing", "message": "Getting transcription of audio"}))
         
-        transcription = audio_to_text(video_and_audio['audio'])
+        transcription = await audio_to_text(video_and_audio['audio'])
         
         if transcription:
             await websocket.send_text(json.dumps({"step": "transcription_generated", "message": "Transcription generated"}))
@@ -157,7 +158,7 @@ async def check_authenticity_websocket(websocket, url: str):
         # get the analysis of the video
         await websocket.send_text(json.dumps({"step": "analyzing_video", "message": "Getting analysis of video"}))
         
-        description = generate_description_from_video(video_and_audio['video'], transcription)
+        description = await asyncio.to_thread(generate_description_from_video, video_and_audio['video'], transcription)
         
         if description['success']:
             await websocket.send_text(json.dumps({"step": "analysis_generated", "message": "Analysis generated"}))
@@ -183,7 +184,7 @@ async def check_authenticity_websocket(websocket, url: str):
         # if the video is worthy, get the if worthy response
         await websocket.send_text(json.dumps({"step": "worthy", "message": "Video is worthy"}))
         
-        if_worthy_response_data = if_worthy_response(description['analysis']['claims'], False)
+        if_worthy_response_data = await if_worthy_response(description['analysis']['claims'], False)
         
         await websocket.send_text(json.dumps({"step": "worthy_response_generated", "message": "If worthy response generated"}))
         await websocket.send_text(json.dumps({"step": "completed", "data": if_worthy_response_data}))
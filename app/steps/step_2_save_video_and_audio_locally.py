@@ -1,9 +1,12 @@
 import os
-import ffmpeg
-from audio_extract import extract_audio
-import subprocess
+import asyncio
 import requests
 from pathlib import Path
+from typing import Optional
+from core.audio import extract_pcm, wav_duration, write_wav
+from core.media_cache import async_media_lock, atomic_write_path, temp_path_for
+from core.transcoder import run_ffmpeg, probe_duration, thread_budget, ProgressCallback, TranscodeError
+from core.media_toolchain import get_media_capabilities, select_video_encoder
 
 ROOT_DIR = Path.cwd() / "reels"
 VIDEO_DIR = ROOT_DIR / "video"
@@ -12,79 +15,70 @@ AUDIO_DIR = ROOT_DIR / "audio"
 for d in [ROOT_DIR, VIDEO_DIR, AUDIO_DIR]:
     d.mkdir(parents=True, exist_ok=True)
 
-def check_ffmpeg_installation() -> bool:
-    try:
-        subprocess.run(
-            ["ffmpeg", "-version"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=True
-        )
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
-
-def save_video_and_audio_locally(url: str, filename: str,log: bool = False):
+async def save_video_and_audio_locally(url: str, filename: str,log: bool = False, on_progress: Optional[ProgressCallback] = None):
     try:
         if not url or not filename:
             return {"success": False}
+        # Concurrent requests for the same reel share one download/transcode
+        async with async_media_lock(os.path.splitext(filename)[0]):
+            # Check if video and audio already exist
+            video_path = VIDEO_DIR / filename
+            video_name = os.path.splitext(filename)[0]
+            audio_path = AUDIO_DIR / f"{video_name}.wav"
+
+            if video_path.exists() and audio_path.exists():
+                if log:
+                    print("Video and audio already exist, skipping download and processing")
+                video_url = f"/reels/video/{filename}"
+                audio_filename = f"{video_name}.wav"
+                audio_url = f"/reels/audio/{audio_filename}"
+                return {
+                    "success": True,
+                    "video": video_url,
+                    "audio": audio_url
+                }
+
+            if log:
+                print("Downloading video")
+            video_path = await asyncio.to_thread(download_reel, url, filename)
+            if log:
+                if video_path:
+                    print("Video downloaded")
+                else:
+                    print("Failed to download video")
+            if log:
+                print("Converting video to audio")
+            if not video_path:
+                return {"success": False}
 
-        # Check if video and audio already exist
-        video_path = VIDEO_DIR / filename
-        video_name = os.path.splitext(filename)[0]
-        audio_path = AUDIO_DIR / f"{video_name}.mp3"
-        
-        if video_path.exists() and audio_path.exists():
             if log:
-                print("Video and audio already exist, skipping download and processing")
+                print("Compressing video")
+            audio_path = await asyncio.to_thread(video_to_audio, video_path)
+            if not audio_path:
+                return {"success": False}
+
+            if log:
+                print("Compressing video")
+            # The 16 kHz PCM just written already says how long the reel is; no ffprobe needed
+            duration = await asyncio.to_thread(wav_duration, audio_path)
+            compressed_video_path = await compress_reel(video_path, on_progress, duration)
+            if log:
+                if compressed_video_path:
+                    print("Video compressed")
+                else:
+                    print("Failed to compress video")
+            if not compressed_video_path:
+                return {"success": False}
+
             video_url = f"/reels/video/{filename}"
-            audio_filename = f"{video_name}.mp3"
+            audio_filename = os.path.basename(audio_path)
             audio_url = f"/reels/audio/{audio_filename}"
+
             return {
                 "success": True,
                 "video": video_url,
                 "audio": audio_url
             }
-
-        if log:
-            print("Downloading video")
-        video_path = download_reel(url, filename)
-        if log:
-            if video_path:
-                print("Video downloaded")
-            else:
-                print("Failed to download video")
-        if log:
-            print("Converting video to audio")
-        if not video_path:
-            return {"success": False}
-
-        if log:
-            print("Compressing video")
-        audio_path = video_to_audio(video_path)
-        if not audio_path:
-            return {"success": False}
-
-        if log:
-            print("Compressing video")
-        compressed_video_path = compress_reel(video_path)
-        if log:
-            if compressed_video_path:
-                print("Video compressed")
-            else:
-                print("Failed to compress video")
-        if not compressed_video_path:
-            return {"success": False}
-        
-        video_url = f"/reels/video/{filename}"
-        audio_filename = os.path.basename(audio_path)
-        audio_url = f"/reels/audio/{audio_filename}"
-
-        return {
-            "success": True,
-            "video": video_url,
-            "audio": audio_url
-        }
     except Exception:
         return {"success": False}
 
@@ -96,19 +90,21 @@ def download_reel(url: str, filename: str) -> str:
         }
         response = requests.get(url, stream=True, timeout=30, headers=headers)
         response.raise_for_status()
-        with open(file_path, 'wb') as writer:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    writer.write(chunk)
+        with atomic_write_path(file_path) as temp_path:
+            with open(temp_path, 'wb') as writer:
+                for chunk in response.iter_content(chunk_size=8192):
+                    if chunk:
+                        writer.write(chunk)
         return str(file_path)
     except Exception:
         return None
 
-def compress_reel(video_path: str) -> str:
+async def compress_reel(video_path: str, on_progress: Optional[ProgressCallback] = None,
+                        duration: Optional[float] = None) -> str:
+    input_path = Path(video_path)
+    temp_path = None
+    final_temp_path = None
     try:
-        input_path = Path(video_path)
-        temp_path = VIDEO_DIR / f"temp_{input_path.name}"
-
         if not input_path.exists():
             return None
 
@@ -116,80 +112,80 @@ def compress_reel(video_path: str) -> str:
         if original_size <= 2:
             return str(input_path)
 
-        if not check_ffmpeg_installation():
+        # Capabilities are probed once at startup; no per-call `ffmpeg -version`
+        if not get_media_capabilities().ffmpeg:
             return str(input_path)
 
+        if duration is None:
+            duration = await probe_duration(input_path)
+        encoder = select_video_encoder(duration, thread_budget.load)
+        if encoder is None:
+            return str(input_path)
+
+        # Unique temp names so concurrent transcodes never clobber each other's output
+        temp_path = temp_path_for(input_path)
         try:
-            (
-                ffmpeg
-                .input(str(input_path))
-                .output(
-                    str(temp_path),
-                    vcodec='libx264',
-                    preset='fast',
-                    crf=28,
-                    maxrate='1M',
-                    bufsize='2M',
-                    acodec='aac',
-                    audio_bitrate='128k',
-                    movflags='+faststart',
-                    vf='scale=720:-2'
-                )
-                .overwrite_output()
-                .run(capture_stdout=True, quiet=True)
+            await run_ffmpeg(
+                input_path,
+                temp_path,
+                [
+                    *encoder.args,
+                    '-c:a', 'aac',
+                    '-b:a', '128k',
+                    '-movflags', '+faststart',
+                    '-vf', 'scale=720:-2',
+                ],
+                on_progress=on_progress,
+                duration=duration,
             )
-        except ffmpeg.Error:
+        except TranscodeError:
             return None
 
         compressed_size = temp_path.stat().st_size / (1024 * 1024)
         if compressed_size > 3:
-            final_temp_path = VIDEO_DIR / f"final_temp_{input_path.name}"
+            final_temp_path = temp_path_for(input_path)
+            encoder = select_video_encoder(duration, thread_budget.load, aggressive=True)
             try:
-                (
-                    ffmpeg
-                    .input(str(temp_path))
-                    .output(
-                        str(final_temp_path),
-                        vcodec='libx264',
-                        preset='fast',
-                        crf=32,
-                        maxrate='800k',
-                        bufsize='1600k',
-                        acodec='aac',
-                        audio_bitrate='96k',
-                        movflags='+faststart',
-                        vf='scale=640:-2'
-                    )
-                    .overwrite_output()
-                    .run(capture_stdout=True, quiet=True)
+                await run_ffmpeg(
+                    temp_path,
+                    final_temp_path,
+                    [
+                        *encoder.args,
+                        '-c:a', 'aac',
+                        '-b:a', '96k',
+                        '-movflags', '+faststart',
+                        '-vf', 'scale=640:-2',
+                    ],
+                    on_progress=on_progress,
+                    duration=duration,
                 )
-            except ffmpeg.Error:
+            except TranscodeError:
                 return None
-            temp_path.unlink()
-            final_temp_path.rename(temp_path)
+            os.replace(final_temp_path, temp_path)
 
-        input_path.unlink()
-        temp_path.rename(input_path)
+        # Atomic swap: readers see either the original or the fully written compressed file
+        os.replace(temp_path, input_path)
         return str(input_path)
     except Exception:
-        temp_path = VIDEO_DIR / f"temp_{Path(video_path).name}"
-        final_temp_path = VIDEO_DIR / f"final_temp_{Path(video_path).name}"
-        if temp_path.exists():
-            temp_path.unlink()
-        if final_temp_path.exists():
-            final_temp_path.unlink()
         return None
+    finally:
+        for path in (temp_path, final_temp_path):
+            if path and path.exists():
+                path.unlink()
 
 def video_to_audio(video_path: str) -> str:
+    # Whisper-native 16 kHz mono PCM, so step 3 can read the samples without decoding again
     try:
         video_filename = os.path.basename(video_path)
         video_name = os.path.splitext(video_filename)[0]
-        audio_path = AUDIO_DIR / f"{video_name}.mp3"
+        audio_path = AUDIO_DIR / f"{video_name}.wav"
         if audio_path.exists():
             return str(audio_path)
         if not os.path.exists(video_path):
             return None
-        extract_audio(input_path=video_path, output_path=str(audio_path))
+        samples = extract_pcm(video_path)
+        with atomic_write_path(audio_path) as temp_path:
+            write_wav(temp_path, samples)
         return str(audio_path)
     except Exception:
         return None
@@ -1,11 +1,152 @@
 import os
-import whisper
-
-def audio_to_text(audio_path: str) -> str:
-    if audio_path.startswith("/reels/audio/"):
-        filename = os.path.basename(audio_path)
-        audio_path = os.path.join(os.path.dirname(__file__), "../../reels/audio", filename)
-        audio_path = os.path.normpath(audio_path)
-    model = whisper.load_model("base")
-    result = model.transcribe(audio_path, task="translate")
-    return result["text"]
\ No newline at end of file
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+import numpy as np
+from core.audio import read_wav, SAMPLE_RATE
+from core.config import settings
+from core.transcription_service import (
+    PROFILES,
+    TranscriptionProfile,
+    choose_profile,
+    detect_language,
+    get_whisper_model,
+    track_transcription,
+    transcription_queue_depth,
+    whisper_batcher,
+    whisper_model_lock,
+)
+from core.transcript_cache import audio_digest, transcript_cache, transcript_key
+from core.parallel_transcription import transcribe_parallel, plan_chunks, merge_chunk_results
+from app.steps.substeps.step_3a_detect_speech import detect_speech_regions, compact_speech, to_original_time
+
+SegmentCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+STREAM_CHUNK_SECONDS = 30
+
+def _transcribe_serial(samples: np.ndarray, task: str, profile: TranscriptionProfile,
+                       initial_prompt: Optional[str] = None) -> Dict[str, Any]:
+    model = get_whisper_model(profile.model)
+    with whisper_model_lock(profile.model):
+        return model.transcribe(samples, task=task, initial_prompt=initial_prompt, **profile.transcribe_options())
+
+def _to_original(segment: Dict[str, Any], offsets: List[Tuple[float, float]]) -> Dict[str, Any]:
+    return {
+        "start": round(to_original_time(segment["start"], offsets), 2),
+        "end": round(to_original_time(segment["end"], offsets), 2),
+        "text": segment["text"],
+    }
+
+async def _transcribe_streaming(speech: np.ndarray, offsets: List[Tuple[float, float]], task: str,
+                                profile: TranscriptionProfile, on_segment: SegmentCallback) -> Dict[str, Any]:
+    """
+    Serial transcription in ~30 s chunks cut at silences, handing each segment to `on_segment`
+    as soon as its chunk is decoded. The previous chunk's text is passed as Whisper's prompt
+    so context carries across the cuts.
+    """
+    boundaries = [int(compact_start * SAMPLE_RATE) for compact_start, _ in offsets[1:]]
+    chunks = plan_chunks(len(speech), boundaries, STREAM_CHUNK_SECONDS)
+    results: List[Dict[str, Any]] = []
+    emitted = 0
+    merged = {"text": "", "segments": []}
+    for index, (start, end) in enumerate(chunks):
+        prompt = merged["text"][-200:] or None
+        results.append(await asyncio.to_thread(_transcribe_serial, speech[start:end], task, profile, prompt))
+        merged = merge_chunk_results(chunks[:index + 1], results)
+        for segment in merged["segments"][emitted:]:
+            await on_segment(_to_original(segment, offsets))
+        emitted = len(merged["segments"])
+    return merged
+
+def _cache_candidates(requested: str, chosen: TranscriptionProfile) -> List[TranscriptionProfile]:
+    """Profiles whose transcript is at least as good as `chosen`: the requested one first, then best to worst."""
+    names = list(PROFILES)
+    acceptable = [PROFILES[name] for name in reversed(names[names.index(chosen.name):])]
+    first = [p for p in acceptable if p.name == requested]
+    return first + [p for p in acceptable if p.name != requested]
+
+def _choose_task(samples: np.ndarray, profile: TranscriptionProfile) -> str:
+    # English needs no translation pass; everything else is translated to English for step 4
+    return "transcribe" if detect_language(samples, profile.model) == "en" else "translate"
+
+async def transcribe_speech(samples: np.ndarray, task: Optional[str] = None, profile: Optional[str] = None,
+                            on_segment: Optional[SegmentCallback] = None) -> Dict[str, Any]:
+    """
+    Transcribe only the speech in `samples`; segment timestamps are on the original timeline.
+    Music intros and silence are cut out before Whisper, so its cost scales with speech duration.
+    Repeat audio (re-submissions, reposts, retries) is served from the transcript cache.
+
+    `profile` (default settings.TRANSCRIPTION_PROFILE) is stepped down for long reels and a busy
+    queue; `task` defaults to "transcribe" for English speech and "translate" otherwise.
+    `on_segment` receives each segment as soon as it is available.
+    """
+    with track_transcription():
+        chosen = choose_profile(
+            profile or settings.TRANSCRIPTION_PROFILE,
+            len(samples) / SAMPLE_RATE,
+            transcription_queue_depth() - 1,
+        )
+        requested_task = task or "auto"
+        digest = await asyncio.to_thread(audio_digest, samples)
+
+        def key_for(candidate: TranscriptionProfile) -> str:
+            return transcript_key(digest, candidate.model, requested_task, **candidate.transcribe_options())
+
+        # A busy queue steps the profile down; a transcript already made at the chosen or any better profile still serves
+        for candidate in _cache_candidates(profile or settings.TRANSCRIPTION_PROFILE, chosen):
+            cached = transcript_cache.get(key_for(candidate))
+            if cached is not None:
+                if on_segment:
+                    for segment in cached["segments"]:
+                        await on_segment(segment)
+                return cached
+
+        if settings.TRANSCRIPTION_VAD:
+            regions = detect_speech_regions(samples)
+        else:
+            regions = [(0, len(samples))]
+        speech, offsets = compact_speech(samples, regions)
+        if len(speech) == 0:
+            # Not cached: a silent verdict from the detector is cheap to recompute and may improve with it
+            return {"text": "", "segments": [], "speech_seconds": 0.0, "profile": chosen.name, "task": task}
+
+        batched = settings.WHISPER_BATCH_WINDOW_MS > 0
+        pooled = settings.TRANSCRIPTION_WORKERS > 0 and len(speech) / SAMPLE_RATE >= settings.PARALLEL_TRANSCRIPTION_SECONDS
+        streamed = on_segment is not None and not pooled and not batched
+
+        task = task or await asyncio.to_thread(_choose_task, speech, chosen)
+        if pooled:
+            # Joins between VAD regions are silences, the natural places to cut
+            boundaries = [int(compact_start * SAMPLE_RATE) for compact_start, _ in offsets[1:]]
+            result = await transcribe_parallel(speech, boundaries, task, chosen.model, chosen.transcribe_options())
+        elif batched:
+            result = await asyncio.wrap_future(
+                whisper_batcher.submit(speech, task, chosen.model, chosen.beam_size)
+            )
+        elif streamed:
+            result = await _transcribe_streaming(speech, offsets, task, chosen, on_segment)
+        else:
+            result = await asyncio.to_thread(_transcribe_serial, speech, task, chosen)
+        segments = [_to_original(segment, offsets) for segment in result["segments"]]
+        if on_segment and not streamed:
+            # Pooled paths finish all at once; still deliver their segments through the same channel
+            for segment in segments:
+                await on_segment(segment)
+        transcript = {
+            "text": result["text"],
+            "segments": segments,
+            "speech_seconds": len(speech) / SAMPLE_RATE,
+            "profile": chosen.name,
+            "task": task,
+        }
+        transcript_cache.set(key_for(chosen), transcript)
+        return transcript
+
+async def audio_to_text(audio: Union[str, np.ndarray], profile: Optional[str] = None,
+                        on_segment: Optional[SegmentCallback] = None) -> str:
+    if isinstance(audio, str):
+        if audio.startswith("/reels/audio/"):
+            filename = os.path.basename(audio)
+            audio = os.path.join(os.path.dirname(__file__), "../../reels/audio", filename)
+            audio = os.path.normpath(audio)
+        # step 2 stores 16 kHz mono PCM, so this is a plain read rather than an ffmpeg decode
+        audio = read_wav(audio)
+    return (await transcribe_speech(audio, profile=profile, on_segment=on_segment))["text"]
@@ -1,13 +1,15 @@
-import json
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from core.config import settings
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+from core.llm import get_llm
 from langchain_core.messages import HumanMessage
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.prompts import ChatPromptTemplate
+from core.structured_output import TolerantJsonOutputParser
+from core.prompts import compile_prompt
 from pydantic import BaseModel, Field
+from app.steps.substeps.step_4a_extract_keyframes import extract_keyframes
+from app.steps.substeps.step_4b_upload_video import video_media_part
 
 
 class VideoClaim(BaseModel):
@@ -36,36 +38,20 @@ class VideoAnalysis(BaseModel):
     category: str = Field(description="Type of video - e.g., meme, educational, vlog, news, etc.")
     claims: List[VideoClaim] = Field(description="List of key claims made in the video, with evidence and a verification flag")
     summary: str = Field(description="A clear, concise, and user-friendly summary of the video's overall content, explaining its main points, events, or themes in simple, everyday language. Avoid jargon unless necessary, and make it understandable to a broad audience. If the video is abstract, artistic, or lacks a clear narrative, describe its style, tone, and key elements so the viewer knows what to expect.")
+    short_summary: str = Field(description="The core message of the video in one or two short, simple sentences, written for end users.")
     is_worthy: bool = Field(description="Whether the overall video is worth verifying")
-    why_not_worthy: Optional[str] = Field(description="If not worthy, explain why. Else, null")
+    why_not_worthy: Optional[str] = Field(description="If not worthy, explain in one line, written for end users, why it doesn't need fact-checking. Else, null")
 
-def generate_description_from_video(video_url: str, transcript: Optional[str] = None) -> Dict[str, Any]:
-    try:
-        if not video_url:
-            return {"success": False}
-
-        if video_url.startswith("/"):
-            video_path = Path.cwd() / video_url[1:]
-        else:
-            video_path = Path.cwd() / video_url
-
-        if not video_path.exists():
-            return {"success": False}
-
-        google_api_key = settings.GOOGLE_API_KEY
-
-        if not google_api_key:
-            return {"success": False}
-
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=google_api_key,
-            temperature=0.1,
-        )
 
-        parser = JsonOutputParser(pydantic_object=VideoAnalysis)
+FRAMES_NOTE = """
+You are given keyframes sampled from the video in chronological order instead of the video itself.
+The audio is represented only by the transcript.
+"""
 
-        base_prompt = """
+# The transcript is a template variable, never spliced into the text, so braces in speech can't
+# break formatting; its budget bounds the prompt for long reels
+VIDEO_ANALYSIS_PROMPT = compile_prompt(
+    "video_analysis", """
 You are an expert fact-checking analyst.
 
 Your job is to analyze a short video and provide structured data.
@@ -77,6 +63,7 @@ Tasks:
 2. Determine whether the video is worthy of checking:
     - If it contains health, political, scientific, or potentially misleading claims, set is_worthy to true.
     - If it's just humor, entertainment, or doesn't contain any factual claims, set is_worthy to false and explain why in why_not_worthy.
+    - Always fill summary and short_summary; for videos that are not worthy they are shown to the user as-is.
 
 3. If is_worthy is true, extract each major claim made:
     - claim: The specific message or assertion in the video with specific details.
@@ -111,77 +98,83 @@ Special instruction:
 - If transcript is provided, and its good enough, use it more to understand the context of the video.
 
 Remember: Quality over quantity. Only extract claims that genuinely need fact-checking, not obvious truths.
-"""
-
-        if transcript:
-            transcript_section = f"""
+{media_note}
 
 Use the transcript below to understand context. Do not include it in your final response.
 ```
 {transcript}
 ```
-"""
-            full_prompt = base_prompt + transcript_section
+""",
+    TolerantJsonOutputParser(pydantic_object=VideoAnalysis, label="video_analysis"),
+    budgets={"transcript": 4000},
+)
+
+
+def generate_description_from_video(video_url: str, transcript: Optional[str] = None, mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Analyze a reel with Gemini. `mode` (default settings.VIDEO_ANALYSIS_MODE) is "video" to upload
+    the whole file, or "frames" to send only deduplicated keyframes alongside the transcript.
+    """
+    try:
+        mode = mode or settings.VIDEO_ANALYSIS_MODE
+        if not video_url:
+            return {"success": False}
+
+        if video_url.startswith("/"):
+            video_path = Path.cwd() / video_url[1:]
         else:
-            full_prompt = base_prompt
-
-        prompt_template = ChatPromptTemplate.from_messages([
-            ("human", full_prompt)
-        ])
-
-        with open(video_path, 'rb') as video_file:
-            video_buffer = video_file.read()
-
-        file_extension = video_path.suffix.lower()
-        mime_type_map = {
-            ".mp4": "video/mp4",
-            ".webm": "video/webm",
-            ".avi": "video/x-msvideo",
-            ".mov": "video/quicktime",
-            ".mkv": "video/x-matroska",
-        }
-        mime_type = mime_type_map.get(file_extension, "video/mp4")
+            video_path = Path.cwd() / video_url
 
-        message = HumanMessage(
-            content=[
-                {
-                    "type": "text",
-                    "text": prompt_template.format_messages(
-                        format_instructions=parser.get_format_instructions()
-                    )[0].content
-                },
-                {
-                    "type": "media",
-                    "mime_type": mime_type,
-                    "data": video_buffer
-                }
+        if not video_path.exists():
+            return {"success": False}
+
+        google_api_key = settings.GOOGLE_API_KEY
+
+        if not google_api_key:
+            return {"success": False}
+
+        llm = get_llm(temperature=0.1, schema=VideoAnalysis)
+
+        if mode == "frames":
+            media_parts = [
+                {"type": "media", "mime_type": "image/jpeg", "data": frame}
+                for frame in extract_keyframes(video_path)
             ]
+        else:
+            media_parts = [video_media_part(video_path)]
+
+        prompt_text = VIDEO_ANALYSIS_PROMPT.render(
+            media_note=FRAMES_NOTE if mode == "frames" else "",
+            transcript=transcript or "No transcript available.",
+        )
+
+        message = HumanMessage(
+            content=[{"type": "text", "text": prompt_text}, *media_parts]
         )
 
+        started = time.perf_counter()
         response = llm.invoke([message])
+        usage = getattr(response, "usage_metadata", None) or {}
+        # Per-call cost figures so "video" and "frames" modes can be compared side by side
+        metrics = {
+            "mode": mode,
+            "media_parts": len(media_parts),
+            "request_bytes": len(prompt_text.encode()) + sum(len(part.get("data", b"")) for part in media_parts),
+            "input_tokens": usage.get("input_tokens"),
+            "output_tokens": usage.get("output_tokens"),
+            "latency_seconds": round(time.perf_counter() - started, 3),
+        }
 
         try:
-            parsed_analysis = parser.parse(response.content)
-        except Exception as parse_error:
-            try:
-                import re
-                json_match = re.search(r'\{.*\}', response.content, re.DOTALL)
-                if json_match:
-                    parsed_analysis = json.loads(json_match.group())
-                else:
-                    raise ValueError("No valid JSON found in response")
-            except:
-                parsed_analysis = {
-                    "category": "Unknown",
-                    "claims": [],
-                    "is_worthy": False,
-                    "why_not_worthy": "Unable to parse structured analysis.",
-                    "raw_response": response.content
-                }
+            parsed_analysis = VIDEO_ANALYSIS_PROMPT.parser.parse(response.content)
+        except Exception:
+            # Unrecoverable output: fail the step rather than report a made-up "not worthy" verdict
+            return {"success": False, "metrics": metrics}
 
         response_data = {
             "success": True,
             "analysis": parsed_analysis,
+            "metrics": metrics,
         }
 
         return response_data
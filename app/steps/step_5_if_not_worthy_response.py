@@ -2,10 +2,10 @@ from pydantic import BaseModel, Field
 from typing import Optional
 import logging
 from datetime import datetime
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from core.config import settings
+from core.llm import get_llm
+from core.llm_cache import invoke_prompt
+from core.prompts import compile_prompt
+from core.structured_output import TolerantJsonOutputParser
 
 
 class DDGSQueryConfig(BaseModel):
@@ -18,43 +18,8 @@ class DDGSQueryConfig(BaseModel):
     backend: str = Field(default="auto", description="Backend search engine")
 
 
-class AIBasedDDGSOptimizer:
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-        
-        # Valid parameter values
-        self.valid_regions = [
-            'us-en', 'uk-en', 'ca-en', 'au-en', 'de-de', 'fr-fr', 'es-es', 
-            'it-it', 'ru-ru', 'cn-zh', 'jp-jp', 'kr-kr', 'in-en', 'br-pt',
-            'mx-es', 'ar-es', 'nl-nl', 'se-sv', 'no-no', 'dk-da', 'fi-fi',
-            'pl-pl', 'wt-wt'
-        ]
-        
-        self.valid_safesearch = ['on', 'moderate', 'off']
-        self.valid_timelimits = ['d', 'w', 'm', 'y', None]
-        self.valid_backends = [
-            'auto', 'bing', 'brave', 'duckduckgo', 'google', 'mojeek',
-            'mullvad_brave', 'mullvad_google', 'yandex', 'yahoo', 'wikipedia'
-        ]
-        
-        # Initialize LLM
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.3
-        )
-        
-        self.parser = JsonOutputParser(pydantic_object=DDGSQueryConfig)
-        
-    def optimize_query(self, query: str) -> dict:
-        """
-        Optimize search query using AI
-        """
-        try:
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            current_year = datetime.now().year
-            
-            prompt = ChatPromptTemplate.from_template("""
+OPTIMIZE_QUERY_PROMPT = compile_prompt(
+    "optimize_query", """
 You are an expert search query optimizer for DuckDuckGo Search (DDGS). Your job is to analyze a user's search query and optimize it for better results by determining the best search parameters.
 
 Current date: {current_date}
@@ -119,16 +84,50 @@ Analyze the query and provide optimized search parameters:
 {format_instructions}
 
 Respond ONLY with valid JSON. No additional text or explanation.
-""")
-            
-            chain = prompt | self.llm | self.parser
+""",
+    TolerantJsonOutputParser(pydantic_object=DDGSQueryConfig, label="optimize_query"),
+    budgets={"query": 300},
+)
+
+
+class AIBasedDDGSOptimizer:
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        
+        # Valid parameter values
+        self.valid_regions = [
+            'us-en', 'uk-en', 'ca-en', 'au-en', 'de-de', 'fr-fr', 'es-es', 
+            'it-it', 'ru-ru', 'cn-zh', 'jp-jp', 'kr-kr', 'in-en', 'br-pt',
+            'mx-es', 'ar-es', 'nl-nl', 'se-sv', 'no-no', 'dk-da', 'fi-fi',
+            'pl-pl', 'wt-wt'
+        ]
+        
+        self.valid_safesearch = ['on', 'moderate', 'off']
+        self.valid_timelimits = ['d', 'w', 'm', 'y', None]
+        self.valid_backends = [
+            'auto', 'bing', 'brave', 'duckduckgo', 'google', 'mojeek',
+            'mullvad_brave', 'mullvad_google', 'yandex', 'yahoo', 'wikipedia'
+        ]
+        
+        # Initialize LLM
+        self.llm = get_llm(temperature=0.3, schema=DDGSQueryConfig)
+        
+        self.parser = OPTIMIZE_QUERY_PROMPT.parser
+        
+    def optimize_query(self, query: str) -> dict:
+        """
+        Optimize search query using AI
+        """
+        try:
+            current_date = datetime.now().strftime("%Y-%m-%d")
+            current_year = datetime.now().year
             
-            result = chain.invoke({
-                "query": query,
-                "current_date": current_date,
-                "current_year": current_year,
-                "format_instructions": self.parser.get_format_instructions()
-            })
+            result = invoke_prompt(
+                OPTIMIZE_QUERY_PROMPT, self.llm,
+                query=query,
+                current_date=current_date,
+                current_year=current_year,
+            )
             
             # Handle both Pydantic model and dict responses
             if hasattr(result, 'dict'):
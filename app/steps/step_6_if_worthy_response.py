@@ -1,58 +1,107 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from core.config import settings
+from core.llm_cache import track_llm_usage
 from app.steps.substeps.step_6a_can_llm_check import can_verify_with_llm
 from app.steps.substeps.step_6b_check_with_llm import verify_claim_with_llm
-from app.steps.substeps.step_6c_check_on_web import verify_claim_with_web_search
-from app.steps.substeps.step_6d_generate_overall_results import generate_overall_assessment
-from app.steps.substeps.step_6e_verify_claim_with_perplexity import verify_claim_with_perplexity
+from app.steps.substeps.step_6d_generate_overall_results import generate_overall_assessment, polish_overall_assessment
+from app.steps.substeps.step_6f_route_and_verify_claims import route_and_verify_claims
+from app.steps.substeps.step_6g_hedged_web_verification import is_hard_claim, verify_claim_on_web_hedged
+from app.steps.substeps.step_6h_reuse_claim_verdicts import find_known_verdicts, remember_verdicts, reuse_for_duplicate
+from app.steps.substeps.step_6i_speculative_web_search import SpeculativeSearches
 from fastapi import WebSocket
+import asyncio
 import json
 
-async def if_worthy_response(claims: List[Dict[str, Any]],log: bool = False, websocket: WebSocket = None) -> Dict[str, Any]:
-    """Generate a response for a worthy video."""
-    claim_results = []
+async def if_worthy_response(claims: List[Dict[str, Any]],log: bool = False, websocket: WebSocket = None, polish: Optional[bool] = None) -> Dict[str, Any]:
+    """Generate a response for a worthy video. `polish` (default settings.OVERALL_ASSESSMENT_POLISH) adds the LLM wording pass."""
+    with track_llm_usage() as usage:
+        overall_assessment = await _verify_claims(claims, log, websocket, polish)
+    # LLM requests and estimated prompt tokens this reel cost in step 6
+    overall_assessment["metrics"] = dict(usage)
+    if log:
+        print(f"Step 6 LLM usage: {usage}")
+    return overall_assessment
+
+
+async def _verify_claim(claim: Dict[str, Any], decision: Optional[Dict[str, Any]], log: bool, websocket: WebSocket,
+                        speculation: Optional[SpeculativeSearches] = None) -> Dict[str, Any]:
+    if not claim['is_worth_verifying']:
+        if log:
+            print(f"Skipping claim: {claim['claim']}")
+        claim_result = {
+            "claim": claim.get("claim", ""),
+            "can_verify_with_llm": False,
+            "verification_method": "skipped",
+            "authenticity_score": 1.0,
+            "authenticity_label": "Not Verified",
+            "explanation": "This claim was deemed not significant enough for verification.",
+            "evidence_sources": None,
+            "confidence": 1.0
+        }
+    else:
+        if decision is None:
+            decision = {**(await can_verify_with_llm(claim['claim'])), "result": None}
+        if decision['can_verify_with_llm']:
+            if speculation:
+                speculation.discard(claim['claim'])
+            if log:
+                print(f"Verifying claim: {claim['claim']} with LLM")
+            if websocket:
+                await websocket.send_text(json.dumps({"step": "processing", "message": f"Verifying claim: {claim['claim']} with LLM"}))
+            claim_result = decision['result'] or await verify_claim_with_llm(claim['claim'], claim['evidence'])
+        else:
+            if log:
+                print(f"Verifying claim: {claim['claim']} with web search")
+            if websocket:
+                await websocket.send_text(json.dumps({"step": "processing", "message": f"Verifying claim: {claim['claim']} with web search"}))
+            search = speculation.take(claim['claim'], websocket) if speculation else None
+            claim_result = await verify_claim_on_web_hedged(claim['claim'], claim['evidence'], is_hard_claim(decision), websocket, search)
+    if websocket:
+        truncated_claim = claim['claim'][:100] + "..." if len(claim['claim']) > 100 else claim['claim']
+        await websocket.send_text(json.dumps({"step": "success", "message": f"Claim: {truncated_claim} verified with {claim_result['verification_method']}"}))
+    return claim_result
+
+
+async def _verify_claims(claims: List[Dict[str, Any]], log: bool, websocket: WebSocket, polish: Optional[bool]) -> Dict[str, Any]:
     if log:
         print(f'Verifying {len(claims)} claims')
     if websocket:
         await websocket.send_text(json.dumps({"step": "processing", "message": f"Verifying {len(claims)} claims"}))
-    for claim in claims:
-        if claim['is_worth_verifying']:
-            can_llm_verify = can_verify_with_llm(claim['claim'])
-            if can_llm_verify['can_verify_with_llm']:
-                if log:
-                    print(f"Verifying claim: {claim['claim']} with LLM")
-                if websocket:
-                    await websocket.send_text(json.dumps({"step": "processing", "message": f"Verifying claim: {claim['claim']} with LLM"}))
-                claim_result = verify_claim_with_llm(claim['claim'], claim['evidence'])
-            else:
-                if log:
-                    print(f"Verifying claim: {claim['claim']} with web search")
-                if websocket:
-                    await websocket.send_text(json.dumps({"step": "processing", "message": f"Verifying claim: {claim['claim']} with web search"}))
-                claim_result = await verify_claim_with_web_search(claim['claim'], claim['evidence'], websocket)
-                if claim_result and claim_result['authenticity_label'] == "Unverifiable":
-                    if websocket:
-                        await websocket.send_text(json.dumps({"step": "processing", "message": f"Verifying claim: {claim['claim']} with Perplexity"}))
-                    claim_result = await verify_claim_with_perplexity(claim['claim'], websocket)
-            claim_results.append(claim_result)
-        else:
-            if log:
-                print(f"Skipping claim: {claim['claim']}")
-            claim_results.append({
-                "claim": claim.get("claim", ""),
-                "can_verify_with_llm": False,
-                "verification_method": "skipped",
-                "authenticity_score": 1.0,
-                "authenticity_label": "Not Verified",
-                "explanation": "This claim was deemed not significant enough for verification.",
-                "evidence_sources": None,
-                "confidence": 1.0
-            })
-        if websocket:
-            truncated_claim = claim['claim'][:100] + "..." if len(claim['claim']) > 100 else claim['claim']
-            await websocket.send_text(json.dumps({"step": "success", "message": f"Claim: {truncated_claim} verified with {claim_result['verification_method']}"}))
+    positions = [i for i, claim in enumerate(claims) if claim['is_worth_verifying']]
+    # Past verdicts of the same or near-identical claims, and repeats within this reel, need no verification
+    known, duplicates, vectors = await find_known_verdicts(claims, positions)
+    pending = [i for i in range(len(claims)) if i not in known and i not in duplicates]
+    to_route = [i for i in pending if claims[i]['is_worth_verifying']]
+    # Most claims end up on the web path, so their searches start now instead of after routing
+    speculation = SpeculativeSearches([claims[i]['claim'] for i in to_route], settings.CLAIM_CONCURRENCY) if settings.SPECULATIVE_WEB_SEARCH else None
+    try:
+        # One request routes every claim and already answers the ones model knowledge can settle
+        decisions: Dict[int, Any] = {}
+        if settings.CLAIM_BATCHING:
+            routed = await route_and_verify_claims([claims[i] for i in to_route])
+            decisions = dict(zip(to_route, routed))
+        # Claims are independent; verify them concurrently so their LLM and web waits overlap, a few at a time
+        # so a reel with many claims doesn't fire all its searches and page fetches at once
+        slots = asyncio.Semaphore(max(1, settings.CLAIM_CONCURRENCY))
+
+        async def verify_limited(position: int) -> Dict[str, Any]:
+            async with slots:
+                return await _verify_claim(claims[position], decisions.get(position), log, websocket, speculation)
+
+        verified = dict(zip(pending, await asyncio.gather(*(verify_limited(position) for position in pending))))
+    finally:
+        if speculation:
+            speculation.discard_all()
+    await asyncio.to_thread(remember_verdicts, verified, vectors)
+    results_by_position = {**verified, **known}
+    for position, original in duplicates.items():
+        results_by_position[position] = reuse_for_duplicate(results_by_position[original], claims[position]['claim'], claims[original]['claim'])
+    claim_results = [results_by_position[i] for i in range(len(claims))]
     if log:
         print(f'Generated {len(claim_results)} claim results')
     overall_assessment = generate_overall_assessment(claim_results)
+    if settings.OVERALL_ASSESSMENT_POLISH if polish is None else polish:
+        overall_assessment = await polish_overall_assessment(overall_assessment)
     if log:
         print(f'Generated overall assessment')
     return overall_assessment
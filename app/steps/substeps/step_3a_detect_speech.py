@@ -0,0 +1,147 @@
+from typing import List, Tuple
+import numpy as np
+from core.audio import SAMPLE_RATE
+
+FRAME_SECONDS = 0.03
+# Speech energy is concentrated in the telephone band and rises/falls at syllable rate (~4 Hz)
+SPEECH_BAND_HZ = (300, 3400)
+MODULATION_WINDOW_SECONDS = 0.5
+# Below this share of the clip's non-silent audio, the strict pass has likely missed voice under music
+MIN_SPEECH_COVERAGE = 0.2
+# Frames quieter than this (dBFS) are silence however the rest of the clip sounds
+SILENCE_DB = -50
+# Relaxed pass: syllabic fluctuation of speech-band energy alone, which a steady music bed barely dampens
+RELAXED_MODULATION_DB = 2.0
+
+
+def _frame(samples: np.ndarray, frame_length: int) -> np.ndarray:
+    n_frames = len(samples) // frame_length
+    return samples[:n_frames * frame_length].reshape(n_frames, frame_length)
+
+
+def _runs(flags: np.ndarray) -> List[Tuple[int, int]]:
+    """(start, end) frame indices of each run of True values."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], flags.astype(int), [0]))))
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def _fill_short_runs(flags: np.ndarray, value: bool, max_run: int, interior_only: bool = False) -> np.ndarray:
+    """Flip runs of `value` no longer than `max_run` frames (e.g. close short pauses inside speech)."""
+    flags = flags.copy()
+    for start, end in _runs(flags == value):
+        if interior_only and (start == 0 or end == len(flags)):
+            continue
+        if end - start <= max_run:
+            flags[start:end] = not value
+    return flags
+
+
+def _loudness(frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-frame energy in dB, and whether each frame is loud relative to the clip's noise floor."""
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    noise_floor = np.percentile(energy_db, 10)
+    return energy_db, energy_db > max(noise_floor + 10, -55)
+
+
+def _local_std(values: np.ndarray) -> np.ndarray:
+    window = max(1, int(MODULATION_WINDOW_SECONDS / FRAME_SECONDS))
+    kernel = np.ones(window) / window
+    local_mean = np.convolve(values, kernel, mode="same")
+    return np.sqrt(np.maximum(np.convolve(values ** 2, kernel, mode="same") - local_mean ** 2, 0))
+
+
+def _to_regions(speech: np.ndarray, n_samples: int, frame_length: int, min_speech_seconds: float,
+                max_gap_seconds: float, pad_seconds: float) -> List[Tuple[int, int]]:
+    speech = _fill_short_runs(speech, False, int(max_gap_seconds / FRAME_SECONDS), interior_only=True)
+    speech = _fill_short_runs(speech, True, int(min_speech_seconds / FRAME_SECONDS))
+
+    pad = int(pad_seconds * SAMPLE_RATE)
+    regions: List[Tuple[int, int]] = []
+    for start, end in _runs(speech):
+        start = max(0, start * frame_length - pad)
+        end = min(n_samples, end * frame_length + pad)
+        start, end = int(start), int(end)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
+
+
+def _merge_regions(regions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(regions):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def detect_speech_regions(samples: np.ndarray, min_speech_seconds: float = 0.25,
+                          max_gap_seconds: float = 0.4, pad_seconds: float = 0.2) -> List[Tuple[int, int]]:
+    """
+    Find speech in 16 kHz mono samples with an energy + spectral detector.
+
+    A frame counts as speech when it is loud relative to the clip's noise floor, most of its
+    energy sits in the speech band, and the surrounding energy envelope fluctuates at a
+    syllabic rate (sustained music is loud and band-limited too, but far steadier).
+    Returns (start_sample, end_sample) regions, padded and with short gaps merged.
+
+    A music bed under a voice-over raises the noise floor and dampens the full-band cues, so when
+    that strict pass covers less than MIN_SPEECH_COVERAGE of the non-silent audio, a relaxed pass
+    adds (with wider padding and gap merging) every stretch whose speech-band energy alone is
+    above silence and still fluctuates at syllabic rate.
+    """
+    frame_length = int(FRAME_SECONDS * SAMPLE_RATE)
+    frames = _frame(samples, frame_length)
+    if len(frames) == 0:
+        return []
+
+    energy_db, loud = _loudness(frames)
+
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame_length), axis=1)) ** 2
+    freqs = np.fft.rfftfreq(frame_length, 1 / SAMPLE_RATE)
+    band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= SPEECH_BAND_HZ[1])
+    band_ratio = spectrum[:, band].sum(axis=1) / (spectrum.sum(axis=1) + 1e-10)
+    voiced = band_ratio > 0.5
+    modulated = _local_std(energy_db) > 4.0
+
+    regions = _to_regions(loud & voiced & modulated, len(samples), frame_length,
+                          min_speech_seconds, max_gap_seconds, pad_seconds)
+
+    # Absolute, not relative to the noise floor: a music bed raises the floor to the level of the voice
+    active = energy_db > SILENCE_DB
+    covered = sum(end - start for start, end in regions)
+    if not active.any() or covered >= MIN_SPEECH_COVERAGE * int(active.sum()) * frame_length:
+        return regions
+    band_db = energy_db + 10 * np.log10(band_ratio + 1e-10)
+    band_active = band_db > SILENCE_DB
+    band_modulated = _local_std(band_db) > RELAXED_MODULATION_DB
+    relaxed = _to_regions(band_active & band_modulated, len(samples), frame_length,
+                          min_speech_seconds, max_gap_seconds * 2, pad_seconds * 2.5)
+    return _merge_regions(regions + relaxed)
+
+
+def compact_speech(samples: np.ndarray, regions: List[Tuple[int, int]]) -> Tuple[np.ndarray, List[Tuple[float, float]]]:
+    """
+    Concatenate the speech regions into one array for a single Whisper pass (Whisper encodes
+    fixed 30 s windows, so many short calls would cost more than one compact one).
+    Returns the samples and (compact_start_seconds, original_start_seconds) offsets per region.
+    """
+    offsets = []
+    position = 0
+    for start, end in regions:
+        offsets.append((position / SAMPLE_RATE, start / SAMPLE_RATE))
+        position += end - start
+    if not regions:
+        return samples[:0], offsets
+    return np.concatenate([samples[start:end] for start, end in regions]), offsets
+
+
+def to_original_time(seconds: float, offsets: List[Tuple[float, float]]) -> float:
+    """Map a timestamp in the compacted audio back onto the original reel's timeline."""
+    for compact_start, original_start in reversed(offsets):
+        if seconds >= compact_start:
+            return original_start + (seconds - compact_start)
+    return seconds
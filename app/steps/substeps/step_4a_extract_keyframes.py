@@ -0,0 +1,93 @@
+import re
+from pathlib import Path
+from typing import List, Union
+import ffmpeg
+import numpy as np
+
+# dHash: 9x8 grayscale thumbnail -> 64 horizontal-gradient bits per frame
+HASH_WIDTH = 9
+HASH_HEIGHT = 8
+JPEG_EOI = b"\xff\xd9"
+_OUTPUT_SIZE = re.compile(r"Video: rawvideo[^\n]*?, (\d+)x(\d+)")
+
+
+def decode_frames(video_path: Union[str, Path], fps: float, width: int) -> np.ndarray:
+    """RGB frames (n x height x width x 3) sampled at `fps` and scaled to `width`, from one ffmpeg decode."""
+    out, err = (
+        ffmpeg
+        .input(str(video_path))
+        .filter("fps", fps=fps)
+        .filter("scale", width, -2)
+        .output("pipe:", format="rawvideo", pix_fmt="rgb24")
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    # The scaled height depends on the (rotation-corrected) aspect ratio; ffmpeg reports it for the output stream
+    size = _OUTPUT_SIZE.search(err.decode(errors="ignore").partition("Output #0")[2])
+    if size is None:
+        raise ValueError("Could not determine decoded frame size")
+    frame_width, frame_height = int(size.group(1)), int(size.group(2))
+    frames = np.frombuffer(out, dtype=np.uint8)
+    n_frames = len(frames) // (frame_width * frame_height * 3)
+    return frames[:n_frames * frame_width * frame_height * 3].reshape(n_frames, frame_height, frame_width, 3)
+
+
+def frame_hashes(frames: np.ndarray) -> np.ndarray:
+    """Perceptual difference hashes (n_frames x 64 bools): each frame area-averaged to a 9x8 grayscale thumbnail."""
+    if len(frames) == 0:
+        return np.zeros((0, HASH_WIDTH * HASH_HEIGHT - HASH_HEIGHT), dtype=bool)
+    gray = frames.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    rows = np.linspace(0, gray.shape[1], HASH_HEIGHT + 1).astype(int)[:-1]
+    cols = np.linspace(0, gray.shape[2], HASH_WIDTH + 1).astype(int)[:-1]
+    sums = np.add.reduceat(np.add.reduceat(gray, rows, axis=1), cols, axis=2)
+    counts = np.outer(np.diff(np.append(rows, gray.shape[1])), np.diff(np.append(cols, gray.shape[2])))
+    thumbnails = sums / counts
+    return (thumbnails[:, :, 1:] > thumbnails[:, :, :-1]).reshape(len(frames), -1)
+
+
+def encode_jpegs(frames: np.ndarray) -> List[bytes]:
+    """JPEG-encode RGB frames in one ffmpeg run, split out of its mjpeg stream."""
+    if len(frames) == 0:
+        return []
+    _, height, width, _ = frames.shape
+    stream, _ = (
+        ffmpeg
+        .input("pipe:", format="rawvideo", pix_fmt="rgb24", s=f"{width}x{height}")
+        .output("pipe:", format="image2pipe", vcodec="mjpeg", **{"q:v": 5})
+        .run(input=np.ascontiguousarray(frames).tobytes(), capture_stdout=True, capture_stderr=True)
+    )
+    jpegs = []
+    start = 0
+    while True:
+        end = stream.find(JPEG_EOI, start)
+        if end == -1:
+            break
+        jpegs.append(stream[start:end + len(JPEG_EOI)])
+        start = end + len(JPEG_EOI)
+    return jpegs
+
+
+def select_distinct_frames(hashes: np.ndarray, max_frames: int, min_distance: int) -> List[int]:
+    """
+    Indices of frames whose hash differs from the last kept frame by more than
+    `min_distance` bits, evenly thinned to at most `max_frames`.
+    """
+    if len(hashes) == 0:
+        return []
+    kept = [0]
+    for index in range(1, len(hashes)):
+        if np.count_nonzero(hashes[index] != hashes[kept[-1]]) > min_distance:
+            kept.append(index)
+    if len(kept) > max_frames:
+        picks = np.linspace(0, len(kept) - 1, max_frames).round().astype(int)
+        kept = [kept[i] for i in picks]
+    return kept
+
+
+def extract_keyframes(video_path: Union[str, Path], max_frames: int = 8, fps: float = 1.0,
+                      width: int = 512, min_distance: int = 10) -> List[bytes]:
+    """
+    Representative, near-duplicate-free JPEG keyframes of a video, in chronological order. The video
+    is decoded once; hashes come from those same frames and only the selected ones are encoded.
+    """
+    frames = decode_frames(video_path, fps, width)
+    return encode_jpegs(frames[select_distinct_frames(frame_hashes(frames), max_frames, min_distance)])
@@ -0,0 +1,128 @@
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+import httpx
+from core.config import settings
+from core.media_cache import atomic_write_path, media_lock
+
+FILES_API = "https://generativelanguage.googleapis.com"
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Gemini keeps uploaded files for 48 h; stop reusing a handle an hour before that
+HANDLE_TTL_SECONDS = 47 * 3600
+ACTIVE_TIMEOUT_SECONDS = 120
+
+MIME_TYPES = {
+    ".mp4": "video/mp4",
+    ".webm": "video/webm",
+    ".avi": "video/x-msvideo",
+    ".mov": "video/quicktime",
+    ".mkv": "video/x-matroska",
+}
+
+_client = httpx.Client(timeout=60)
+
+
+def video_mime_type(video_path: Path) -> str:
+    return MIME_TYPES.get(video_path.suffix.lower(), "video/mp4")
+
+
+def _handle_path(video_path: Path) -> Path:
+    return video_path.with_name(f".{video_path.name}.gemini.json")
+
+
+def _read_chunks(video_path: Path) -> Iterator[bytes]:
+    with open(video_path, "rb") as reader:
+        while chunk := reader.read(UPLOAD_CHUNK_BYTES):
+            yield chunk
+
+
+def _cached_handle(video_path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_handle_path(video_path), "r", encoding="utf-8") as reader:
+            handle = json.load(reader)
+    except (OSError, ValueError):
+        return None
+    stat = video_path.stat()
+    if (handle.get("size") != stat.st_size or handle.get("mtime") != stat.st_mtime
+            or handle.get("expires_at", 0) <= time.time()):
+        return None
+    return handle
+
+
+def _upload(video_path: Path, mime_type: str) -> Dict[str, Any]:
+    """Resumable Files API upload, streamed from disk in 1 MB chunks."""
+    size = video_path.stat().st_size
+    start = _client.post(
+        f"{FILES_API}/upload/v1beta/files",
+        params={"key": settings.GOOGLE_API_KEY},
+        headers={
+            "X-Goog-Upload-Protocol": "resumable",
+            "X-Goog-Upload-Command": "start",
+            "X-Goog-Upload-Header-Content-Length": str(size),
+            "X-Goog-Upload-Header-Content-Type": mime_type,
+        },
+        json={"file": {"display_name": video_path.name}},
+    )
+    start.raise_for_status()
+    upload = _client.post(
+        start.headers["x-goog-upload-url"],
+        headers={
+            "Content-Length": str(size),
+            "X-Goog-Upload-Offset": "0",
+            "X-Goog-Upload-Command": "upload, finalize",
+        },
+        content=_read_chunks(video_path),
+    )
+    upload.raise_for_status()
+    file_info = upload.json()["file"]
+
+    # Videos are processed server-side before they can be referenced in a prompt
+    deadline = time.monotonic() + ACTIVE_TIMEOUT_SECONDS
+    while file_info.get("state") == "PROCESSING" and time.monotonic() < deadline:
+        time.sleep(1)
+        status = _client.get(f"{FILES_API}/v1beta/{file_info['name']}", params={"key": settings.GOOGLE_API_KEY})
+        status.raise_for_status()
+        file_info = status.json()
+    if file_info.get("state") != "ACTIVE":
+        raise RuntimeError(f"Uploaded video is {file_info.get('state')}")
+    return file_info
+
+
+def get_video_file_uri(video_path: Path) -> str:
+    """
+    Files API URI for a local video, uploading it once and reusing the handle (stored next to
+    the video, so all workers share it) until the file changes or the upload nears expiry.
+    """
+    with media_lock(f"gemini_{video_path.name}"):
+        handle = _cached_handle(video_path)
+        if handle is None:
+            uploaded_at = time.time()
+            file_info = _upload(video_path, video_mime_type(video_path))
+            stat = video_path.stat()
+            handle = {
+                "uri": file_info["uri"],
+                "expires_at": uploaded_at + HANDLE_TTL_SECONDS,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+            }
+            with atomic_write_path(_handle_path(video_path)) as temp_path:
+                with open(temp_path, "w", encoding="utf-8") as writer:
+                    json.dump(handle, writer)
+        return handle["uri"]
+
+
+def video_media_part(video_path: Path) -> Dict[str, Any]:
+    """
+    Message content block for a video: a Files API reference by default, so the video is never
+    held in memory or base64-encoded per request; inline bytes when VIDEO_UPLOAD_MODE=inline
+    or the upload fails.
+    """
+    mime_type = video_mime_type(video_path)
+    if settings.VIDEO_UPLOAD_MODE == "file_api":
+        try:
+            return {"type": "media", "mime_type": mime_type, "file_uri": get_video_file_uri(video_path)}
+        except Exception:
+            pass
+    with open(video_path, "rb") as video_file:
+        return {"type": "media", "mime_type": mime_type, "data": video_file.read()}
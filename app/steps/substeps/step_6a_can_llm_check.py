@@ -1,21 +1,10 @@
 from typing import Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from core.config import settings
+from core.llm import get_llm
+from core.llm_cache import ainvoke_prompt
+from core.prompts import compile_prompt
+from core.structured_output import TolerantJsonOutputParser
 
-def can_verify_with_llm(claim: str) -> Dict[str, Any]:
-    """Determine if a claim can be verified using LLM knowledge alone."""
-    try:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.1
-        )
-        
-        parser = JsonOutputParser()
-        
-        prompt = ChatPromptTemplate.from_template("""
+CAN_VERIFY_PROMPT = compile_prompt("can_verify_with_llm", """
         You are an expert fact-checker. Analyze the following claim and determine if it can be verified using your existing knowledge alone, or if it requires web search for current/specific information.
 
         Claim: "{claim}"
@@ -33,10 +22,15 @@ def can_verify_with_llm(claim: str) -> Dict[str, Any]:
             "verification_complexity": "simple/moderate/complex",
             "requires_current_data": true/false
         }}
-        """)
+        """, TolerantJsonOutputParser(label="can_verify_with_llm", required=["can_verify_with_llm"]), budgets={"claim": 300})
+
+
+async def can_verify_with_llm(claim: str) -> Dict[str, Any]:
+    """Determine if a claim can be verified using LLM knowledge alone."""
+    try:
+        llm = get_llm(temperature=0.1, json_mode=True)
         
-        chain = prompt | llm | parser
-        result = chain.invoke({"claim": claim})
+        result = await ainvoke_prompt(CAN_VERIFY_PROMPT, llm, claim=claim)
         
         # Ensure result is a dictionary
         if not isinstance(result, dict):
@@ -1,9 +1,9 @@
 from typing import Dict, List, Any, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+from core.llm import get_llm
+from core.llm_cache import ainvoke_prompt
+from core.prompts import compile_prompt
+from core.structured_output import TolerantJsonOutputParser
 from pydantic import BaseModel, Field
-from core.config import settings
 
 
 class ClaimVerificationResult(BaseModel):
@@ -18,18 +18,7 @@ class ClaimVerificationResult(BaseModel):
 
 
 
-def verify_claim_with_llm(claim: str, evidence: str) -> Dict[str, Any]:
-    """Verify a claim using LLM knowledge alone."""
-    try:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.1
-        )
-        
-        parser = JsonOutputParser(pydantic_object=ClaimVerificationResult)
-        
-        prompt = ChatPromptTemplate.from_template("""
+VERIFY_WITH_LLM_PROMPT = compile_prompt("verify_claim_with_llm", """
         You are an expert fact-checker with access to extensive knowledge. Verify the following claim using your existing knowledge.
 
         Claim: "{claim}"
@@ -53,13 +42,15 @@ def verify_claim_with_llm(claim: str, evidence: str) -> Dict[str, Any]:
         }}
 
         Important: Set verification_method to "llm_knowledge" and evidence_sources to null since you're using internal knowledge.
-        """)
+        """, TolerantJsonOutputParser(pydantic_object=ClaimVerificationResult, label="verify_claim_with_llm"), budgets={"claim": 300, "evidence": 800})
+
+
+async def verify_claim_with_llm(claim: str, evidence: str) -> Dict[str, Any]:
+    """Verify a claim using LLM knowledge alone."""
+    try:
+        llm = get_llm(temperature=0.1, schema=ClaimVerificationResult)
         
-        chain = prompt | llm | parser
-        result = chain.invoke({
-            "claim": claim,
-            "evidence": evidence
-        })
+        result = await ainvoke_prompt(VERIFY_WITH_LLM_PROMPT, llm, claim=claim, evidence=evidence)
         
         # Handle both Pydantic model and dict responses
         if hasattr(result, 'dict'):
@@ -1,10 +1,10 @@
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Dict, List, Any, Optional
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+from core.llm import get_llm
+from core.llm_cache import ainvoke_prompt
+from core.prompts import compile_prompt
+from core.structured_output import TolerantJsonOutputParser
 from pydantic import BaseModel, Field
-from core.config import settings
 from src.websearchengine.pipeline import pipeline
 from fastapi import WebSocket
 
@@ -20,41 +20,7 @@ class ClaimVerificationResult(BaseModel):
     confidence: float = Field(description="Confidence level from 0.0 to 1.0")
 
 
-def create_unverifiable_result(claim: str, error_reason: str) -> Dict[str, Any]:
-    """Create a result for claims that cannot be verified."""
-    return {
-        "claim": claim,
-        "can_verify_with_llm": False,
-        "verification_method": "error",
-        "authenticity_score": 0.5,
-        "authenticity_label": "Unverifiable",
-        "explanation": f"Unable to verify this claim due to: {error_reason}",
-        "evidence_sources": None,
-        "confidence": 0.0
-    }
-
-
-async def verify_claim_with_web_search(claim: str, evidence: str, websocket: WebSocket = None) -> Dict[str, Any]:
-    """Verify a claim using web search and evidence."""
-    try:
-        # Use the existing web search pipeline
-        search_query = claim
-        web_results = await pipeline(search_query, websocket)
-        
-        if web_results.get("error"):
-            # print(f"Web search error: {web_results['error']}")
-            return create_unverifiable_result(claim, "Web search failed")
-        
-        # Now use LLM to analyze the web search results
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.1
-        )
-        
-        parser = JsonOutputParser(pydantic_object=ClaimVerificationResult)
-        
-        prompt = ChatPromptTemplate.from_template("""
+VERIFY_ON_WEB_PROMPT = compile_prompt("verify_claim_with_web_search", """
         You are an expert fact-checker. Analyze the following claim using the provided web search evidence.
 
         Claim: "{claim}"
@@ -81,15 +47,47 @@ async def verify_claim_with_web_search(claim: str, evidence: str, websocket: Web
         }}
 
         Important: Set verification_method to "web_search" and include the web sources in evidence_sources.
-        """)
+        """, TolerantJsonOutputParser(pydantic_object=ClaimVerificationResult, label="verify_claim_with_web_search"), budgets={"claim": 300, "evidence": 800, "web_summary": 2000, "web_sources": 500})
+
+
+def create_unverifiable_result(claim: str, error_reason: str) -> Dict[str, Any]:
+    """Create a result for claims that cannot be verified."""
+    return {
+        "claim": claim,
+        "can_verify_with_llm": False,
+        "verification_method": "error",
+        "authenticity_score": 0.5,
+        "authenticity_label": "Unverifiable",
+        "explanation": f"Unable to verify this claim due to: {error_reason}",
+        "evidence_sources": None,
+        "confidence": 0.0
+    }
+
+
+async def verify_claim_with_web_search(claim: str, evidence: str, websocket: WebSocket = None,
+                                       search: Optional[Awaitable[Optional[Dict[str, Any]]]] = None) -> Dict[str, Any]:
+    """Verify a claim using web search and evidence. `search` supplies results already being fetched (speculatively)."""
+    try:
+        web_results = await search if search is not None else None
+        if web_results is None:
+            # Use the existing web search pipeline
+            search_query = claim
+            web_results = await pipeline(search_query, websocket)
         
-        chain = prompt | llm | parser
-        result = chain.invoke({
-            "claim": claim,
-            "evidence": evidence,
-            "web_summary": web_results.get("summary", "No summary available"),
-            "web_sources": json.dumps(web_results.get("sources", []))
-        })
+        if web_results.get("error"):
+            # print(f"Web search error: {web_results['error']}")
+            return create_unverifiable_result(claim, "Web search failed")
+        
+        # Now use LLM to analyze the web search results
+        llm = get_llm(temperature=0.1, schema=ClaimVerificationResult)
+        
+        result = await ainvoke_prompt(
+            VERIFY_ON_WEB_PROMPT, llm,
+            claim=claim,
+            evidence=evidence,
+            web_summary=web_results.get("summary", "No summary available"),
+            web_sources=json.dumps(web_results.get("sources", [])),
+        )
         
         # Handle both Pydantic model and dict responses
         if hasattr(result, 'dict'):
@@ -1,9 +1,10 @@
+from collections import Counter
 from typing import Dict, List, Any, Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+from core.llm import get_llm
+from core.llm_cache import ainvoke_prompt
+from core.prompts import compile_prompt
+from core.structured_output import TolerantJsonOutputParser
 from pydantic import BaseModel, Field
-from core.config import settings
 
 class ClaimVerificationResult(BaseModel):
     claim: str = Field(description="The original claim being verified")
@@ -25,79 +26,107 @@ class OverallVerificationResult(BaseModel):
     recommendation: str = Field(description="Recommendation for users about this content")
 
 
-def generate_overall_assessment(claim_results: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Generate an overall assessment based on individual claim results."""
-    try:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.2
-        )
-        
-        parser = JsonOutputParser(pydantic_object=OverallVerificationResult)
-        
-        # Calculate overall score
-        total_score = sum(result.get("authenticity_score", 0.5) for result in claim_results)
-        overall_score = total_score / len(claim_results) if claim_results else 0.5
-        
-        # Prepare claim summaries for the prompt
-        claim_summaries = []
-        for result in claim_results:
-            claim_summaries.append(f"Claim: {result.get('claim', 'Unknown')}\nLabel: {result.get('authenticity_label', 'Unknown')}\nScore: {result.get('authenticity_score', 0.5)}\nExplanation: {result.get('explanation', 'No explanation')}")
-        
-        prompt = ChatPromptTemplate.from_template("""
+# Per-claim confidence below which a verdict counts as weak evidence and can't decide the overall label
+CONFIDENT = 0.6
+
+RECOMMENDATIONS = {
+    "Contains False Claims": "Do not share this reel as fact; at least one of its claims is false. See the individual results for corrections.",
+    "Misleading": "Treat this reel with caution; some claims are misleading or missing important context.",
+    "Partially Accurate": "Parts of this reel hold up, but not all of it; check the individual results before relying on it.",
+    "Accurate": "The checked claims in this reel are supported by the evidence found.",
+    "Unverified": "These claims could not be confirmed either way; look for trusted sources before sharing.",
+    "No Claims Checked": "Nothing in this reel needed fact-checking.",
+}
+
+
+OVERALL_ASSESSMENT_PROMPT = compile_prompt("generate_overall_assessment", """
         You are an expert fact-checker providing a final assessment of a social media reel's authenticity.
 
-        Based on the individual claim verification results below, provide an overall assessment:
+        The overall verdict below has already been decided from the individual claim verification results.
+        Rewrite its summary and recommendation so they read well for end users. Do not change the verdict.
 
         Individual Claim Results:
         {claim_summaries}
 
+        Overall Verdict: {overall_authenticity}
         Overall Score: {overall_score}
+        Draft Summary: {summary}
 
-        Provide a comprehensive assessment in valid JSON format:
+        Provide the polished assessment in valid JSON format:
         {{
-            "overall_authenticity": "Overall assessment label",
-            "overall_score": {overall_score},
             "summary": "Well-crafted summary explaining the findings",
             "recommendation": "Clear recommendation for users"
         }}
-        """)
-        
-        chain = prompt | llm | parser
-        result = chain.invoke({
-            "claim_summaries": "\n\n".join(claim_summaries),
-            "overall_score": overall_score
-        })
-        
-        # Handle both Pydantic model and dict responses
-        if hasattr(result, 'dict'):
-            result_dict = result.dict()
-        else:
-            result_dict = result if isinstance(result, dict) else {}
-        
-        # Ensure all required fields are present for overall assessment
-        required_fields = {
-            "overall_authenticity": result_dict.get("overall_authenticity", "Assessment Completed"),
-            "overall_score": overall_score,
-            "summary": result_dict.get("summary", "Analysis completed based on individual claim verification results."),
-            "individual_claims": claim_results,
-            "recommendation": result_dict.get("recommendation", "Please review the individual claim results for detailed information.")
-        }
-        
-        # Update with actual results, keeping defaults for missing fields
-        for key, default_value in required_fields.items():
-            if key not in result_dict or result_dict[key] is None:
-                result_dict[key] = default_value
-                
-        return result_dict
-        
-    except Exception as e:
-        # print(f"Error in generate_overall_assessment: {e}")
-        return {
-            "overall_authenticity": "Error in Assessment",
-            "overall_score": 0.5,
-            "summary": f"Unable to generate overall assessment due to error: {str(e)}",
-            "individual_claims": claim_results,
-            "recommendation": "Unable to provide recommendation due to technical issues."
-        }
+        """, TolerantJsonOutputParser(label="generate_overall_assessment"), budgets={"claim_summaries": 3000, "summary": 500})
+
+
+def _overall_label(checked: List[Dict[str, Any]]) -> str:
+    """Deterministic overall verdict: the worst confident per-claim verdict decides."""
+    confident = [r for r in checked if r.get("confidence", 0.0) >= CONFIDENT]
+    labels = [r.get("authenticity_label") for r in confident]
+    if not checked:
+        return "No Claims Checked"
+    if "False" in labels:
+        return "Contains False Claims"
+    if "Misleading" in labels:
+        return "Misleading"
+    if not labels or all(label == "Unverifiable" for label in labels):
+        return "Unverified"
+    if any(label != "True" for label in labels) or len(confident) < len(checked):
+        return "Partially Accurate"
+    return "Accurate"
+
+
+def _summary_text(label: str, checked: List[Dict[str, Any]], total: int) -> str:
+    if not checked:
+        return f"None of the {total} claims in this reel needed verification."
+    counts = Counter(result.get("authenticity_label", "Unverifiable") for result in checked)
+    breakdown = ", ".join(f"{count} {name.lower()}" for name, count in counts.most_common())
+    text = f"Verified {len(checked)} of {total} claims ({breakdown}); overall verdict: {label.lower()}."
+    # Call out the claim that drove a negative verdict
+    worst = min(checked, key=lambda r: (r.get("authenticity_score", 0.5), -r.get("confidence", 0.0)))
+    if label in ("Contains False Claims", "Misleading") and worst.get("explanation"):
+        text += f" Most significant: \"{worst.get('claim', '')}\" - {worst['explanation']}"
+    return text
+
+
+def generate_overall_assessment(claim_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Overall assessment computed locally from the per-claim labels, scores and confidences, so a
+    worthy reel doesn't wait on another LLM round trip. See polish_overall_assessment for LLM wording.
+    """
+    total_score = sum(result.get("authenticity_score", 0.5) for result in claim_results)
+    overall_score = total_score / len(claim_results) if claim_results else 0.5
+    checked = [result for result in claim_results if result.get("verification_method") != "skipped"]
+    label = _overall_label(checked)
+    return {
+        "overall_authenticity": label,
+        "overall_score": overall_score,
+        "summary": _summary_text(label, checked, len(claim_results)),
+        "individual_claims": claim_results,
+        "recommendation": RECOMMENDATIONS[label],
+    }
+
+
+async def polish_overall_assessment(assessment: Dict[str, Any]) -> Dict[str, Any]:
+    """Optional LLM pass rewriting summary and recommendation; verdict and score stay as computed."""
+    claim_summaries = [
+        f"Claim: {result.get('claim', 'Unknown')}\nLabel: {result.get('authenticity_label', 'Unknown')}\nScore: {result.get('authenticity_score', 0.5)}\nExplanation: {result.get('explanation', 'No explanation')}"
+        for result in assessment["individual_claims"]
+    ]
+    try:
+        llm = get_llm(temperature=0.2, json_mode=True)
+        result = await ainvoke_prompt(
+            OVERALL_ASSESSMENT_PROMPT, llm,
+            claim_summaries="\n\n".join(claim_summaries),
+            overall_authenticity=assessment["overall_authenticity"],
+            overall_score=assessment["overall_score"],
+            summary=assessment["summary"],
+        )
+    except Exception:
+        return assessment
+    polished = dict(assessment)
+    for key in ("summary", "recommendation"):
+        if isinstance(result, dict) and result.get(key):
+            polished[key] = result[key]
+    return polished
@@ -1,9 +1,19 @@
-import requests
+import httpx
 from core.config import settings
+from core.http_clients import get_async_client
+from core.structured_output import record_parse, repair_json
+from app.steps.substeps.step_6c_check_on_web import ClaimVerificationResult, create_unverifiable_result
 from fastapi import WebSocket
 from typing import Dict, Any
 import json
-import re
+
+PERPLEXITY_URL = "https://api.perplexity.ai/chat/completions"
+
+
+def _client() -> httpx.AsyncClient:
+    # One pooled async client per process: keep-alive TLS connections to Perplexity are reused across claims and reels
+    return get_async_client("perplexity", timeout=30, limits=httpx.Limits(max_connections=20, max_keepalive_connections=10))
+
 
 async def verify_claim_with_perplexity(claim: str, websocket: WebSocket = None) -> Dict[str, Any]:
     """
@@ -11,8 +21,7 @@ async def verify_claim_with_perplexity(claim: str, websocket: WebSocket = None)
     Returns results in the same format as verify_claim_with_web_search.
     """
     try:
-        # Set up the API endpoint and headers
-        url = "https://api.perplexity.ai/chat/completions"
+        # Set up the API headers
         headers = {
             "Authorization": f"Bearer {settings.PERPLEXITY_KEY}",
             "Content-Type": "application/json"
@@ -56,7 +65,12 @@ Important:
                 }
             ],
             "temperature": 0.1,
-            "max_tokens": 2000
+            "max_tokens": 2000,
+            # Schema-constrained decoding, so the answer is JSON without fences or prose around it
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"schema": ClaimVerificationResult.model_json_schema()},
+            },
         }
 
         # Send WebSocket update if available
@@ -67,7 +81,7 @@ Important:
             })
 
         # Make the API call
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        response = await _client().post(PERPLEXITY_URL, headers=headers, json=payload)
         response.raise_for_status()
 
         # Extract the content from response
@@ -81,34 +95,27 @@ Important:
                 "message": "Processing Perplexity response..."
             })
 
-        # Try to extract JSON from the response
-        # Sometimes the model might wrap JSON in markdown code blocks
-        json_match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            # Try to find JSON object directly
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-            else:
-                json_str = content
-
-        # Parse the JSON response
+        # Parse the JSON response, repairing it if the model was cut off mid-object
         try:
-            result = json.loads(json_str)
+            result = json.loads(content)
+            record_parse("verify_claim_with_perplexity", "clean")
         except json.JSONDecodeError:
-            # If JSON parsing fails, create a structured response from the text
-            result = {
-                "claim": claim,
-                "can_verify_with_llm": False,
-                "verification_method": "web_search",
-                "authenticity_score": 0.5,
-                "authenticity_label": "Unverifiable",
-                "explanation": content,
-                "evidence_sources": [],
-                "confidence": 0.5
-            }
+            result = repair_json(content)
+            if isinstance(result, dict):
+                record_parse("verify_claim_with_perplexity", "repaired")
+            else:
+                record_parse("verify_claim_with_perplexity", "failed")
+                # If JSON parsing fails, create a structured response from the text
+                result = {
+                    "claim": claim,
+                    "can_verify_with_llm": False,
+                    "verification_method": "web_search",
+                    "authenticity_score": 0.5,
+                    "authenticity_label": "Unverifiable",
+                    "explanation": content,
+                    "evidence_sources": [],
+                    "confidence": 0.5
+                }
 
         # Ensure all required fields are present with defaults
         required_fields = {
@@ -140,7 +147,7 @@ Important:
 
         return result
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         # Handle API request errors
         return create_unverifiable_result(claim, f"Perplexity API request failed: {str(e)}")
     except KeyError as e:
@@ -0,0 +1,101 @@
+from typing import Dict, List, Any, Optional
+from core.llm import get_llm
+from core.llm_cache import ainvoke_prompt
+from core.prompts import compile_prompt
+from core.structured_output import TolerantJsonOutputParser
+from pydantic import BaseModel, Field
+
+
+class ClaimDecision(BaseModel):
+    index: int = Field(description="Number of the claim in the input list")
+    can_verify_with_llm: bool = Field(description="Whether this claim can be verified using LLM knowledge alone")
+    reasoning: str = Field(description="Why it can or cannot be verified with LLM knowledge alone")
+    verification_complexity: str = Field(description="simple/moderate/complex")
+    requires_current_data: bool = Field(description="Whether verifying it needs current events, recent news or real-time data")
+    authenticity_score: Optional[float] = Field(description="If verifiable from knowledge, 0.0 to 1.0. Else, null", default=None)
+    authenticity_label: Optional[str] = Field(description="If verifiable from knowledge, one of: 'True', 'False', 'Partially True', 'Misleading', 'Unverifiable'. Else, null", default=None)
+    explanation: Optional[str] = Field(description="If verifiable from knowledge, detailed explanation. Else, null", default=None)
+    confidence: Optional[float] = Field(description="If verifiable from knowledge, 0.0 to 1.0. Else, null", default=None)
+
+
+class ClaimDecisions(BaseModel):
+    claims: List[ClaimDecision] = Field(description="One decision per input claim, in input order")
+
+
+ROUTE_AND_VERIFY_PROMPT = compile_prompt("route_and_verify_claims", """
+        You are an expert fact-checker. For EACH numbered claim below, first decide whether it can be verified using your existing knowledge alone, or if it requires web search for current/specific information.
+
+        Consider these factors:
+        1. Is this about general knowledge, historical facts, scientific principles, a event or news happened in the past or well-established information?
+        2. Does it require current events, recent news, specific statistics, or real-time data?
+        3. Does it involve specific people, companies, or events that might have recent developments?
+        4. Is this a fact or an opinion?
+
+        If it can be verified from your knowledge, also verify it right away:
+        - Is the claim factually accurate based on established knowledge?
+        - Is there any misleading information or context missing?
+        - Are there any logical fallacies or misrepresentations?
+        Fill authenticity_score, authenticity_label, explanation and confidence for it.
+        If it needs web search, leave authenticity_score, authenticity_label, explanation and confidence null.
+        For every claim, whether verifiable from knowledge or not, also rate verification_complexity and whether it requires_current_data.
+
+        Claims (with the evidence from the video):
+        {claims}
+
+        {format_instructions}
+
+        Return exactly one entry per claim, using its number as index.
+        """, TolerantJsonOutputParser(pydantic_object=ClaimDecisions, label="route_and_verify_claims"), budgets={"claims": 4000})
+
+
+def _claim_list(claims: List[Dict[str, Any]]) -> str:
+    return "\n".join(
+        f'{index}. Claim: "{claim["claim"]}"\n   Evidence from video: "{claim.get("evidence", "")}"'
+        for index, claim in enumerate(claims)
+    )
+
+
+async def route_and_verify_claims(claims: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Route every claim of a reel, and verify the knowledge-answerable ones, in a single LLM request.
+    Returns one entry per claim: {"can_verify_with_llm", "verification_complexity", "requires_current_data",
+    "result"}, where "result" is a finished claim result for claims verified from knowledge and None
+    for claims that need the web path.
+    Entries the model left out are None, so the caller falls back to per-claim routing for them.
+    """
+    if not claims:
+        return []
+    try:
+        llm = get_llm(temperature=0.1, schema=ClaimDecisions)
+        result = await ainvoke_prompt(ROUTE_AND_VERIFY_PROMPT, llm, claims=_claim_list(claims))
+    except Exception:
+        return [None] * len(claims)
+
+    decisions: List[Optional[Dict[str, Any]]] = [None] * len(claims)
+    returned = result.get("claims", []) if isinstance(result, dict) else []
+    for decision in returned:
+        if not isinstance(decision, dict):
+            continue
+        index = decision.get("index")
+        if not isinstance(index, int) or not 0 <= index < len(claims) or "can_verify_with_llm" not in decision:
+            continue
+        can_verify = bool(decision["can_verify_with_llm"])
+        verdict = None
+        if can_verify and decision.get("authenticity_label"):
+            verdict = {
+                "claim": claims[index]["claim"],
+                "can_verify_with_llm": True,
+                "verification_method": "llm_knowledge",
+                "authenticity_score": decision.get("authenticity_score") if decision.get("authenticity_score") is not None else 0.5,
+                "authenticity_label": decision["authenticity_label"],
+                "explanation": decision.get("explanation") or "Analysis completed using LLM knowledge",
+                "evidence_sources": None,
+                "confidence": decision.get("confidence") if decision.get("confidence") is not None else 0.5,
+            }
+        decisions[index] = {
+            "can_verify_with_llm": can_verify,
+            "verification_complexity": decision.get("verification_complexity"),
+            "requires_current_data": bool(decision.get("requires_current_data")),
+            "result": verdict,
+        }
+    return decisions
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import threading
+from typing import Awaitable, Dict, Any, Optional
+from fastapi import WebSocket
+from core.config import settings
+from app.steps.substeps.step_6c_check_on_web import verify_claim_with_web_search
+from app.steps.substeps.step_6e_verify_claim_with_perplexity import verify_claim_with_perplexity
+
+_stats = {"web_claims": 0, "hedges_launched": 0, "hedge_won": 0, "web_won": 0, "serial_fallbacks": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def hedge_stats() -> Dict[str, Any]:
+    """How often the Perplexity hedge was launched and how often it delivered the answer first."""
+    with _stats_lock:
+        report = dict(_stats)
+    report["hedge_win_rate"] = round(report["hedge_won"] / report["hedges_launched"], 3) if report["hedges_launched"] else 0.0
+    return report
+
+
+def is_hard_claim(decision: Optional[Dict[str, Any]]) -> bool:
+    """Routing's own prediction that a claim is slow to settle from web search."""
+    if not decision:
+        return False
+    return decision.get("verification_complexity") == "complex" or bool(decision.get("requires_current_data"))
+
+
+def _confident(result: Optional[Dict[str, Any]]) -> bool:
+    return bool(result) and result.get("authenticity_label") != "Unverifiable"
+
+
+async def verify_claim_on_web_hedged(claim: str, evidence: str, hard: bool, websocket: WebSocket = None,
+                                     search: Optional[Awaitable[Optional[Dict[str, Any]]]] = None) -> Dict[str, Any]:
+    """
+    Web-search verification with Perplexity as a hedge. Under PERPLEXITY_HEDGE=hard (default) the
+    hedge starts PERPLEXITY_HEDGE_DELAY seconds in for claims routing predicted to be hard, under
+    "always" for every claim; the first confident result wins and the other request is cancelled.
+    Without a hedge, Perplexity still runs afterwards when web search comes back Unverifiable.
+    """
+    _count("web_claims")
+    web = asyncio.create_task(verify_claim_with_web_search(claim, evidence, websocket, search))
+    policy = settings.PERPLEXITY_HEDGE
+    if policy == "always" or (policy == "hard" and hard):
+        done, _ = await asyncio.wait({web}, timeout=settings.PERPLEXITY_HEDGE_DELAY)
+        if not done:
+            return await _race(claim, web, websocket)
+    result = await web
+    if _confident(result):
+        return result
+    _count("serial_fallbacks")
+    if websocket:
+        await websocket.send_text(json.dumps({"step": "processing", "message": f"Verifying claim: {claim} with Perplexity"}))
+    return await verify_claim_with_perplexity(claim, websocket)
+
+
+async def _race(claim: str, web: asyncio.Task, websocket: WebSocket) -> Dict[str, Any]:
+    _count("hedges_launched")
+    if websocket:
+        await websocket.send_text(json.dumps({"step": "processing", "message": f"Verifying claim: {claim} with Perplexity"}))
+    perplexity = asyncio.create_task(verify_claim_with_perplexity(claim, websocket))
+    pending = {web, perplexity}
+    result = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                result = task.result()
+                if _confident(result):
+                    _count("hedge_won" if task is perplexity else "web_won")
+                    return result
+        # Neither was confident; the Perplexity answer (as in the serial path) is the one reported
+        return perplexity.result()
+    finally:
+        for task in pending:
+            task.cancel()
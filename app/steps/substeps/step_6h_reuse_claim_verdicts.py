@@ -0,0 +1,75 @@
+import asyncio
+import copy
+from typing import Dict, List, Any, Tuple
+import numpy as np
+from core.claim_index import claim_index, collapse_duplicates, embed_claims
+from core.config import settings
+
+# Verdicts that say nothing about the claim itself aren't worth reusing
+NOT_REUSABLE_METHODS = {"skipped", "error"}
+
+
+def _adapt(record: Dict[str, Any], claim: str, similarity: float) -> Dict[str, Any]:
+    """A stored verdict restated for `claim`; near-duplicate matches lose confidence in proportion."""
+    result = copy.deepcopy(record["verdict"])
+    result["claim"] = claim
+    result["matched_claim"] = record["claim"]
+    result["similarity"] = round(similarity, 4)
+    result["verified_at"] = record["verified_at"]
+    if similarity < 1.0:
+        result["confidence"] = round(result.get("confidence", 0.5) * similarity, 4)
+    return result
+
+
+async def find_known_verdicts(claims: List[Dict[str, Any]], positions: List[int]) -> Tuple[Dict[int, Dict[str, Any]], Dict[int, int], Dict[int, np.ndarray]]:
+    """
+    Resolve what can be answered without verification. Returns (verdicts from the index by
+    position, in-reel duplicates as position -> position of the claim they repeat, embeddings by
+    position for storing new verdicts).
+    """
+    if not settings.CLAIM_INDEX or not positions:
+        return {}, {}, {}
+    texts = [claims[i]['claim'] for i in positions]
+    try:
+        vectors = await asyncio.to_thread(embed_claims, texts)
+    except Exception:
+        # Reuse is an optimization; without the embedding model every claim is simply verified
+        return {}, {}, {}
+    # Lookups may reload the index from disk and scan every stored vector; keep them off the event loop
+    known, duplicates = await asyncio.to_thread(_resolve, texts, vectors, positions)
+    return known, duplicates, {position: vectors[k] for k, position in enumerate(positions)}
+
+
+def _resolve(texts: List[str], vectors: np.ndarray, positions: List[int]) -> Tuple[Dict[int, Dict[str, Any]], Dict[int, int]]:
+    canonical = collapse_duplicates(vectors, texts, settings.CLAIM_DEDUP_THRESHOLD)
+    known: Dict[int, Dict[str, Any]] = {}
+    duplicates: Dict[int, int] = {}
+    for k, position in enumerate(positions):
+        if canonical[k] != k:
+            duplicates[position] = positions[canonical[k]]
+            claim_index.count_duplicate()
+            continue
+        hit = claim_index.lookup(texts[k], vectors[k])
+        if hit is not None:
+            record, similarity = hit
+            known[position] = _adapt(record, texts[k], similarity)
+    return known, duplicates
+
+
+def reuse_for_duplicate(result: Dict[str, Any], claim: str, original: str) -> Dict[str, Any]:
+    duplicate = copy.deepcopy(result)
+    duplicate["claim"] = claim
+    duplicate["matched_claim"] = original
+    return duplicate
+
+
+def remember_verdicts(results: Dict[int, Dict[str, Any]], vectors: Dict[int, np.ndarray]) -> None:
+    """Store freshly verified verdicts, in one index write per reel, so later reels repeating the claims can reuse them."""
+    entries = []
+    for position, result in results.items():
+        if position not in vectors or result.get("verification_method") in NOT_REUSABLE_METHODS:
+            continue
+        if result.get("authenticity_label") == "Unverifiable":
+            continue
+        entries.append((result["claim"], vectors[position], result))
+    claim_index.add_many(entries)
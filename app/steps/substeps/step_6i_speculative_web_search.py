@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from fastapi import WebSocket
+from src.websearchengine.pipeline import pipeline
+
+# A wasted search always costs its DDGS query: cancelling the task doesn't stop the query already running in
+# its worker thread. Cancellation only saves the page fetches, counted in wasted_fetches_cancelled.
+_stats = {"speculated": 0, "used": 0, "wasted": 0, "wasted_fetches_cancelled": 0, "seconds_saved": 0.0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str, amount: float = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def speculation_stats() -> Dict[str, Any]:
+    """Speculative searches started, how many the web path used, how many routing made redundant, latency saved."""
+    with _stats_lock:
+        report = dict(_stats)
+    report["seconds_saved"] = round(report["seconds_saved"], 3)
+    report["waste_rate"] = round(report["wasted"] / report["speculated"], 3) if report["speculated"] else 0.0
+    return report
+
+
+class _DeferredProgress:
+    """
+    Stands in for the websocket of a search nobody has claimed yet: progress messages are held
+    until `attach` hands over the real websocket, then replayed and forwarded live.
+    """
+
+    def __init__(self):
+        self._pending: List[str] = []
+        self._websocket: Optional[WebSocket] = None
+
+    async def send_text(self, text: str) -> None:
+        if self._websocket is None:
+            self._pending.append(text)
+        else:
+            await self._websocket.send_text(text)
+
+    async def attach(self, websocket: WebSocket) -> None:
+        pending, self._pending = self._pending, []
+        for text in pending:
+            await websocket.send_text(text)
+        self._websocket = websocket
+
+
+class SpeculativeSearches:
+    """
+    Web search + page fetch for every claim, started while routing is still deciding. The web path
+    takes its claim's search via `take`; claims routed to model knowledge have theirs cancelled via `discard`.
+    """
+
+    def __init__(self, claims: List[str], concurrency: int):
+        self._started = time.monotonic()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._progress: Dict[str, _DeferredProgress] = {}
+        self._finished: Dict[asyncio.Task, float] = {}
+        self._slots = asyncio.Semaphore(max(1, concurrency))
+        for claim in claims:
+            if claim not in self._tasks:
+                self._progress[claim] = _DeferredProgress()
+                task = asyncio.create_task(self._search(claim))
+                task.add_done_callback(lambda done: self._finished.setdefault(done, time.monotonic()))
+                self._tasks[claim] = task
+                _count("speculated")
+
+    async def _search(self, claim: str) -> Dict[str, Any]:
+        async with self._slots:
+            return await pipeline(claim, self._progress[claim])
+
+    async def take(self, claim: str, websocket: Optional[WebSocket] = None) -> Optional[Dict[str, Any]]:
+        """
+        The speculative search result for `claim`, waiting for it if still running; None if none was started.
+        Its "Reading" progress so far is replayed to `websocket`, and the rest is sent live.
+        """
+        task = self._tasks.pop(claim, None)
+        progress = self._progress.pop(claim, None)
+        if task is None:
+            return None
+        if websocket is not None:
+            await progress.attach(websocket)
+        needed_at = time.monotonic()
+        result = await task
+        # Whatever the search got done before the web path asked for it is latency removed from this claim
+        _count("used")
+        _count("seconds_saved", min(needed_at, self._finished.get(task, needed_at)) - self._started)
+        return result
+
+    def discard(self, claim: str) -> None:
+        task = self._tasks.pop(claim, None)
+        self._progress.pop(claim, None)
+        if task is None:
+            return
+        _count("wasted")
+        if task.done():
+            if not task.cancelled():
+                task.exception()
+        else:
+            task.cancel()
+            _count("wasted_fetches_cancelled")
+
+    def discard_all(self) -> None:
+        for claim in list(self._tasks):
+            self.discard(claim)
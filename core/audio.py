@@ -0,0 +1,52 @@
+import wave
+from pathlib import Path
+from typing import Union
+
+import ffmpeg
+import numpy as np
+
+# Whisper's native input format: 16 kHz, mono, float32 in [-1, 1]
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # bytes per s16le sample
+
+
+def extract_pcm(video_path: Union[str, Path]) -> np.ndarray:
+    """Decode the audio track of a video straight to 16 kHz mono float32 samples."""
+    out, _ = (
+        ffmpeg
+        .input(str(video_path))
+        .output('pipe:', format='s16le', acodec='pcm_s16le', ac=1, ar=SAMPLE_RATE)
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return pcm_bytes_to_samples(out)
+
+
+def pcm_bytes_to_samples(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+
+
+def samples_to_pcm_bytes(samples: np.ndarray) -> bytes:
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+
+
+def write_wav(path: Union[str, Path], samples: np.ndarray) -> None:
+    with wave.open(str(path), 'wb') as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(SAMPLE_WIDTH)
+        writer.setframerate(SAMPLE_RATE)
+        writer.writeframes(samples_to_pcm_bytes(samples))
+
+
+def read_wav(path: Union[str, Path]) -> np.ndarray:
+    """Read a WAV written by write_wav back into Whisper-ready samples without re-decoding."""
+    with wave.open(str(path), 'rb') as reader:
+        if (reader.getnchannels() != 1 or reader.getsampwidth() != SAMPLE_WIDTH
+                or reader.getframerate() != SAMPLE_RATE):
+            raise ValueError(f"{path} is not 16 kHz mono s16le audio")
+        return pcm_bytes_to_samples(reader.readframes(reader.getnframes()))
+
+
+def wav_duration(path: Union[str, Path]) -> float:
+    """Seconds of audio in a WAV, from its header alone."""
+    with wave.open(str(path), 'rb') as reader:
+        return reader.getnframes() / reader.getframerate()
@@ -0,0 +1,198 @@
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from core.config import settings
+from core.embedding_models import get_embedding_model
+from core.media_cache import atomic_write_path, media_lock
+
+CLAIM_INDEX_DIR = Path.cwd() / "reels" / "claim_index"
+CLAIM_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+
+# Unit vectors are stored as int8 (x127); a dot product of two of them / 127^2 approximates cosine similarity
+SCALE = 127
+
+def embed_claims(texts: List[str]) -> np.ndarray:
+    """L2-normalized float32 sentence embeddings, one row per text."""
+    return get_embedding_model().encode(texts, normalize_embeddings=True, show_progress_bar=False).astype(np.float32)
+
+
+def normalize_claim(text: str) -> str:
+    return " ".join(re.findall(r"[\w$%.]+", text.lower()))
+
+
+_MONTHS = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*"
+_FACT = re.compile(
+    r"[$€£¥]?\d[\d,]*(?:\.\d+)?(?:\s?%|\s?(?:percent|k|thousand|million|billion|trillion)\b)?"
+    rf"|\b{_MONTHS}\.?(?=\s+\d)|(?<=\d\s){_MONTHS}\b",
+    re.IGNORECASE,
+)
+
+
+def key_facts(text: str) -> Tuple[str, ...]:
+    """
+    Numbers, amounts, percentages and dated months of a claim, normalized. Embeddings barely move when only
+    these change ("costs $299" vs "costs $399"), so near-duplicates must agree on them exactly.
+    """
+    facts = []
+    for match in _FACT.finditer(text):
+        fact = re.sub(r"[,\s]", "", match.group().lower())
+        facts.append(fact[:3] if fact[0].isalpha() else fact.replace("percent", "%"))
+    return tuple(sorted(facts))
+
+
+def quantize(vectors: np.ndarray) -> np.ndarray:
+    return np.clip(np.round(vectors * SCALE), -SCALE, SCALE).astype(np.int8)
+
+
+# Rows of the stored matrix widened to int32 at a time, so a query never copies the whole index
+SIMILARITY_BLOCK_ROWS = 4096
+
+
+def similarities(vectors: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Approximate cosine similarity of int8 `vectors` (n, d) against every row of `matrix` (m, d)."""
+    queries = vectors.astype(np.int32)
+    scores = np.empty((len(vectors), len(matrix)), dtype=np.float32)
+    for start in range(0, len(matrix), SIMILARITY_BLOCK_ROWS):
+        block = matrix[start:start + SIMILARITY_BLOCK_ROWS].astype(np.int32)
+        scores[:, start:start + len(block)] = queries @ block.T
+    return scores / float(SCALE * SCALE)
+
+
+class ClaimIndex:
+    """
+    Past claim verdicts keyed by normalized text (exact hits) and by int8 embedding (near duplicates),
+    persisted as vectors.npy + records.json and shared by all workers through the files' mtime.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._vectors = np.zeros((0, 0), dtype=np.int8)
+        self._records: List[Dict[str, Any]] = []
+        self._exact: Dict[str, int] = {}
+        self._loaded_mtime = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"exact_hits": 0, "near_hits": 0, "misses": 0, "in_reel_duplicates": 0, "fact_mismatches": 0}
+
+    @property
+    def _records_path(self) -> Path:
+        return self.directory / "records.json"
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.directory / "vectors.npy"
+
+    def _refresh(self) -> None:
+        """Reload from disk when another worker has written a newer index."""
+        try:
+            mtime = self._records_path.stat().st_mtime
+        except OSError:
+            return
+        if mtime <= self._loaded_mtime:
+            return
+        try:
+            with open(self._records_path, "r", encoding="utf-8") as reader:
+                records = json.load(reader)
+            vectors = np.load(self._vectors_path)
+        except (OSError, ValueError):
+            return
+        if len(records) != len(vectors):
+            return
+        self._records, self._vectors, self._loaded_mtime = records, vectors, mtime
+        self._exact = {record["key"]: i for i, record in enumerate(records)}
+
+    def _fresh(self, record: Dict[str, Any]) -> bool:
+        return time.time() - record["verified_at"] < settings.CLAIM_INDEX_TTL_HOURS * 3600
+
+    def lookup(self, claim: str, vector: np.ndarray) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Most similar fresh verdict at or above CLAIM_INDEX_THRESHOLD as (record, similarity), else None."""
+        with self._lock:
+            self._refresh()
+            index = self._exact.get(normalize_claim(claim))
+            if index is not None and self._fresh(self._records[index]):
+                self._stats["exact_hits"] += 1
+                return self._records[index], 1.0
+            if len(self._records):
+                facts = key_facts(claim)
+                scores = similarities(quantize(vector[None, :]), self._vectors)[0]
+                for best in np.argsort(-scores)[:5]:
+                    if scores[best] < settings.CLAIM_INDEX_THRESHOLD:
+                        break
+                    if key_facts(self._records[best]["claim"]) != facts:
+                        self._stats["fact_mismatches"] += 1
+                        continue
+                    if self._fresh(self._records[best]):
+                        self._stats["near_hits"] += 1
+                        return self._records[best], min(float(scores[best]), 1.0)
+            self._stats["misses"] += 1
+            return None
+
+    def add_many(self, entries: List[Tuple[str, np.ndarray, Dict[str, Any]]]) -> None:
+        """
+        Store (claim, vector, verdict) entries in one write, replacing older verdicts of the same
+        normalized claim and dropping every record past CLAIM_INDEX_TTL_HOURS, so the files stay bounded.
+        """
+        if not entries:
+            return
+        now = time.time()
+        with media_lock("claim_index"), self._lock:
+            self._refresh()
+            new_keys = {normalize_claim(claim) for claim, _, _ in entries}
+            keep = [i for i, record in enumerate(self._records) if self._fresh(record) and record["key"] not in new_keys]
+            records = [self._records[i] for i in keep]
+            rows = [self._vectors[keep]] if keep else []
+            added: Dict[str, int] = {}
+            for claim, vector, verdict in entries:
+                key = normalize_claim(claim)
+                record = {"key": key, "claim": claim, "verdict": verdict, "verified_at": now}
+                if key in added:
+                    records[added[key]] = record
+                    continue
+                added[key] = len(records)
+                records.append(record)
+                rows.append(quantize(vector[None, :]))
+            vectors = np.vstack(rows)
+            try:
+                with atomic_write_path(self._vectors_path) as temp_path:
+                    with open(temp_path, "wb") as writer:
+                        np.save(writer, vectors)
+                with atomic_write_path(self._records_path) as temp_path:
+                    with open(temp_path, "w", encoding="utf-8") as writer:
+                        json.dump(records, writer)
+                self._loaded_mtime = self._records_path.stat().st_mtime
+            except (OSError, TypeError, ValueError):
+                return
+            self._records, self._vectors = records, vectors
+            self._exact = {record["key"]: i for i, record in enumerate(records)}
+
+    def count_duplicate(self) -> None:
+        with self._lock:
+            self._stats["in_reel_duplicates"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["exact_hits"] + self._stats["near_hits"] + self._stats["misses"]
+            hits = self._stats["exact_hits"] + self._stats["near_hits"]
+            return {**self._stats, "entries": len(self._records),
+                    "hit_rate": round(hits / lookups, 3) if lookups else 0.0}
+
+
+claim_index = ClaimIndex(CLAIM_INDEX_DIR)
+
+
+def collapse_duplicates(vectors: np.ndarray, texts: List[str], threshold: float) -> List[int]:
+    """
+    For each row, the index of the first earlier row at or above `threshold` similarity with the same
+    key facts (itself if none).
+    """
+    quantized = quantize(vectors)
+    scores = similarities(quantized, quantized)
+    facts = [key_facts(text) for text in texts]
+    canonical = []
+    for i in range(len(vectors)):
+        earlier = [j for j in range(i) if canonical[j] == j and scores[i, j] >= threshold and facts[i] == facts[j]]
+        canonical.append(earlier[0] if earlier else i)
+    return canonical
@@ -8,5 +8,52 @@ class Settings:
     MONGODB_URL: str = os.getenv("MONGODB_URL")
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     PERPLEXITY_KEY: str = os.getenv("PERPLEXITY_KEY")
+    # Total encoder threads shared by all concurrent ffmpeg jobs, and the per-job cap / timeout
+    FFMPEG_THREAD_BUDGET: int = int(os.getenv("FFMPEG_THREAD_BUDGET", os.cpu_count() or 1))
+    FFMPEG_JOB_THREADS: int = int(os.getenv("FFMPEG_JOB_THREADS", "2"))
+    FFMPEG_TIMEOUT: float = float(os.getenv("FFMPEG_TIMEOUT", "300"))
+    # "video" uploads the whole compressed reel to Gemini, "frames" sends deduplicated keyframes only
+    VIDEO_ANALYSIS_MODE: str = os.getenv("VIDEO_ANALYSIS_MODE", "video")
+    # "file_api" uploads each video once to the Gemini Files API and reuses the handle, "inline" embeds the bytes
+    VIDEO_UPLOAD_MODE: str = os.getenv("VIDEO_UPLOAD_MODE", "file_api")
+    # Run Whisper only on voice-activity-detected speech regions
+    TRANSCRIPTION_VAD: bool = os.getenv("TRANSCRIPTION_VAD", "true").lower() == "true"
+    # fast | balanced | accurate; picks the Whisper model and decoding settings (see core/transcription_service.py)
+    TRANSCRIPTION_PROFILE: str = os.getenv("TRANSCRIPTION_PROFILE", "balanced")
+    # Queued/running transcriptions at which profiles step down to a cheaper level
+    TRANSCRIPTION_BUSY_DEPTH: int = int(os.getenv("TRANSCRIPTION_BUSY_DEPTH", "4"))
+    # > 0 routes transcription through the cross-request micro-batcher, collecting windows for this long
+    WHISPER_BATCH_WINDOW_MS: float = float(os.getenv("WHISPER_BATCH_WINDOW_MS", "0"))
+    WHISPER_MAX_BATCH: int = int(os.getenv("WHISPER_MAX_BATCH", "8"))
+    # In-memory LRU size of the transcript cache (the disk tier under reels/transcripts is unbounded)
+    TRANSCRIPT_CACHE_SIZE: int = int(os.getenv("TRANSCRIPT_CACHE_SIZE", "256"))
+    LLM_CACHE_SIZE: int = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+    # int8 dynamic quantization of Whisper's linear layers for CPU-only deployments
+    WHISPER_QUANTIZE: bool = os.getenv("WHISPER_QUANTIZE", "false").lower() == "true"
+    # Long reels (>= PARALLEL_TRANSCRIPTION_SECONDS of speech) are split at silences into ~PARALLEL_CHUNK_SECONDS
+    # chunks and transcribed on a pool of TRANSCRIPTION_WORKERS processes; 0 workers keeps the serial path
+    TRANSCRIPTION_WORKERS: int = int(os.getenv("TRANSCRIPTION_WORKERS", "0"))
+    PARALLEL_TRANSCRIPTION_SECONDS: float = float(os.getenv("PARALLEL_TRANSCRIPTION_SECONDS", "180"))
+    PARALLEL_CHUNK_SECONDS: float = float(os.getenv("PARALLEL_CHUNK_SECONDS", "60"))
+    # Route all claims of a reel (and verify the knowledge-answerable ones) in one LLM request instead of one or two per claim
+    CLAIM_BATCHING: bool = os.getenv("CLAIM_BATCHING", "true").lower() == "true"
+    # Perplexity hedge for web-verified claims: "hard" (claims routing predicts are hard), "always" or "off";
+    # the hedge starts this many seconds after web search unless web search has already answered
+    PERPLEXITY_HEDGE: str = os.getenv("PERPLEXITY_HEDGE", "hard")
+    PERPLEXITY_HEDGE_DELAY: float = float(os.getenv("PERPLEXITY_HEDGE_DELAY", "2"))
+    # Reuse verdicts of past claims at or above CLAIM_INDEX_THRESHOLD embedding similarity for CLAIM_INDEX_TTL_HOURS,
+    # and verify claims of one reel that are CLAIM_DEDUP_THRESHOLD-similar to each other only once
+    CLAIM_INDEX: bool = os.getenv("CLAIM_INDEX", "true").lower() == "true"
+    CLAIM_INDEX_THRESHOLD: float = float(os.getenv("CLAIM_INDEX_THRESHOLD", "0.92"))
+    CLAIM_INDEX_TTL_HOURS: float = float(os.getenv("CLAIM_INDEX_TTL_HOURS", "72"))
+    CLAIM_DEDUP_THRESHOLD: float = float(os.getenv("CLAIM_DEDUP_THRESHOLD", "0.9"))
+    # Claims of one reel verified at once, and speculative searches running at once (each fetches up to ~10 pages)
+    CLAIM_CONCURRENCY: int = int(os.getenv("CLAIM_CONCURRENCY", "4"))
+    # Start each claim's web search + page fetch while routing is still deciding; cancelled if it picks model knowledge
+    SPECULATIVE_WEB_SEARCH: bool = os.getenv("SPECULATIVE_WEB_SEARCH", "true").lower() == "true"
+    # Load the shared sentence-embedding model at startup instead of on the first request that embeds text
+    EMBEDDING_WARMUP: bool = os.getenv("EMBEDDING_WARMUP", "false").lower() == "true"
+    # The overall assessment is computed locally; "true" adds an LLM pass that rewrites its summary wording
+    OVERALL_ASSESSMENT_POLISH: bool = os.getenv("OVERALL_ASSESSMENT_POLISH", "false").lower() == "true"
 
 settings = Settings()
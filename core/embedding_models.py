@@ -0,0 +1,49 @@
+import threading
+import time
+from typing import Any, Dict, Iterable
+
+DEFAULT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_models: Dict[str, Any] = {}
+_load_stats: Dict[str, Dict[str, float]] = {}
+_models_lock = threading.Lock()
+
+
+def _parameter_bytes(model: Any) -> int:
+    try:
+        return sum(p.numel() * p.element_size() for p in model.parameters())
+    except Exception:
+        return 0
+
+
+def get_embedding_model(name: str = DEFAULT_EMBEDDING_MODEL) -> Any:
+    """
+    Process-wide SentenceTransformer per model name, loaded on first use (or by `warm_up_embedding_models`).
+    Web retrieval and the claim index share it, so each worker holds one copy and requests that never
+    embed anything never pay for loading it.
+    """
+    model = _models.get(name)
+    if model is None:
+        with _models_lock:
+            model = _models.get(name)
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+                started = time.perf_counter()
+                model = SentenceTransformer(name)
+                _load_stats[name] = {
+                    "load_seconds": round(time.perf_counter() - started, 3),
+                    "parameter_mb": round(_parameter_bytes(model) / 2**20, 1),
+                }
+                _models[name] = model
+    return model
+
+
+def warm_up_embedding_models(names: Iterable[str] = (DEFAULT_EMBEDDING_MODEL,)) -> None:
+    """Load models ahead of the first request, so its latency doesn't include the model load."""
+    for name in names:
+        get_embedding_model(name)
+
+
+def embedding_model_stats() -> Dict[str, Dict[str, float]]:
+    with _models_lock:
+        return {name: dict(stats) for name, stats in _load_stats.items()}
@@ -0,0 +1,27 @@
+import asyncio
+from typing import Any, Dict, Tuple
+import httpx
+
+_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def get_async_client(name: str, **options: Any) -> httpx.AsyncClient:
+    """
+    Pooled httpx.AsyncClient per name, created on first use. A client's connection pool is bound
+    to the event loop it first ran on, so a new loop (another asyncio.run) gets a new client.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(name)
+    if entry is None or entry[0] is not loop or entry[1].is_closed:
+        entry = (loop, httpx.AsyncClient(**options))
+        _clients[name] = entry
+    return entry[1]
+
+
+async def close_async_clients() -> None:
+    """Close every client created on the running loop; called from the app's shutdown hook."""
+    loop = asyncio.get_running_loop()
+    for name, (client_loop, client) in list(_clients.items()):
+        if client_loop is loop:
+            await client.aclose()
+            del _clients[name]
@@ -0,0 +1,47 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+from langchain_core.utils.json_schema import dereference_refs
+from langchain_google_genai import ChatGoogleGenerativeAI
+from core.config import settings
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+_clients: Dict[Tuple[str, float, bool, Optional[type]], ChatGoogleGenerativeAI] = {}
+_clients_lock = threading.Lock()
+
+
+def _response_schema(schema: type) -> Dict[str, Any]:
+    """A pydantic model's JSON schema with nested models inlined; Gemini's response_schema has no $ref."""
+    inlined = dereference_refs(schema.model_json_schema())
+    inlined.pop("$defs", None)
+    return inlined
+
+
+def get_llm(model: str = DEFAULT_MODEL, temperature: float = 0.1, json_mode: bool = False,
+            schema: Optional[type] = None) -> ChatGoogleGenerativeAI:
+    """
+    Process-wide Gemini chat client per (model, temperature, json_mode, schema). Clients are thread-safe and keep
+    their HTTP/gRPC channels and auth warm, so building one per call only adds setup latency.
+    `json_mode` turns on Gemini's constrained JSON decoding, so structured prompts always get a JSON body;
+    `schema` (a pydantic model, implies json_mode) also constrains it to that model's fields.
+    """
+    json_mode = json_mode or schema is not None
+    key = (model, temperature, json_mode, schema)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                options: Dict[str, Any] = {}
+                if json_mode:
+                    options["response_mime_type"] = "application/json"
+                if schema is not None:
+                    options["response_schema"] = _response_schema(schema)
+                client = ChatGoogleGenerativeAI(
+                    model=model,
+                    google_api_key=settings.GOOGLE_API_KEY,
+                    temperature=temperature,
+                    **options,
+                )
+                _clients[key] = client
+    return client
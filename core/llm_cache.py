@@ -0,0 +1,182 @@
+import copy
+import contextvars
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+from core.config import settings
+from core.media_cache import atomic_write_path
+from core.prompts import estimate_tokens
+
+LLM_CACHE_DIR = Path.cwd() / "reels" / "llm_cache"
+LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+HOUR = 3600
+DAY = 24 * HOUR
+# How long a memoized answer stays valid per chain; web-backed verdicts go stale fastest
+CHAIN_TTLS: Dict[str, float] = {
+    "can_verify_with_llm": 7 * DAY,
+    "route_and_verify_claims": DAY,
+    "verify_claim_with_llm": DAY,
+    "verify_claim_with_web_search": 6 * HOUR,
+    "generate_overall_assessment": 7 * DAY,
+    "optimize_query": DAY,
+    "not_worthy_response": 7 * DAY,
+    "summarize_data": DAY,
+}
+DEFAULT_TTL = DAY
+
+
+def _prompt_version(prompt) -> str:
+    """Template fingerprint, so editing a prompt invalidates its cached answers automatically."""
+    return hashlib.sha256(repr(prompt).encode()).hexdigest()[:16]
+
+
+def chain_key(name: str, prompt, llm, inputs: Dict[str, Any]) -> str:
+    payload = {
+        "chain": name,
+        "model": getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+        "prompt_version": _prompt_version(prompt),
+        "inputs": inputs,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ChainMemo:
+    """In-memory LRU in front of a JSON-per-entry disk tier, with per-chain TTLs and hit counters."""
+
+    def __init__(self, directory: Path, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, name: str, outcome: str) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+            stats[outcome] += 1
+
+    def get(self, name: str, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[0] > now:
+                self._memory.move_to_end(key)
+                hit = True
+            else:
+                hit = False
+        if hit:
+            self._count(name, "memory_hits")
+            return True, entry[1]
+        try:
+            with open(self.directory / f"{key}.json", "r", encoding="utf-8") as reader:
+                stored = json.load(reader)
+            if stored["expires_at"] > now:
+                self._remember(key, stored["expires_at"], stored["value"])
+                self._count(name, "disk_hits")
+                return True, stored["value"]
+        except (OSError, ValueError, KeyError):
+            pass
+        self._count(name, "misses")
+        return False, None
+
+    def set(self, name: str, key: str, value: Any) -> None:
+        expires_at = time.time() + CHAIN_TTLS.get(name, DEFAULT_TTL)
+        self._remember(key, expires_at, value)
+        try:
+            with atomic_write_path(self.directory / f"{key}.json") as temp_path:
+                with open(temp_path, "w", encoding="utf-8") as writer:
+                    json.dump({"expires_at": expires_at, "value": value}, writer)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            report = {}
+            for name, stats in self._stats.items():
+                total = sum(stats.values())
+                hits = stats["memory_hits"] + stats["disk_hits"]
+                report[name] = {**stats, "hit_rate": round(hits / total, 3) if total else 0.0}
+            return report
+
+
+chain_memo = ChainMemo(LLM_CACHE_DIR, settings.LLM_CACHE_SIZE)
+
+# Requests and estimated prompt tokens actually sent to a model (memo hits excluded), per tracked scope
+_usage: "contextvars.ContextVar[Optional[Dict[str, int]]]" = contextvars.ContextVar("llm_usage", default=None)
+
+
+@contextmanager
+def track_llm_usage() -> Iterator[Dict[str, int]]:
+    """Count LLM requests and prompt tokens made inside the block, including from to_thread workers."""
+    usage = {"llm_requests": 0, "prompt_tokens": 0}
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+def _record_usage(prompt, inputs: Dict[str, Any]) -> None:
+    usage = _usage.get()
+    if usage is None:
+        return
+    usage["llm_requests"] += 1
+    try:
+        usage["prompt_tokens"] += sum(estimate_tokens(str(m.content)) for m in prompt.format_messages(**inputs))
+    except Exception:
+        pass
+
+
+def invoke_chain(name: str, prompt, llm, parser, inputs: Dict[str, Any]) -> Any:
+    """
+    `(prompt | llm | parser).invoke(inputs)`, memoized on model, temperature, prompt template
+    and rendered inputs. Only successful, JSON-serializable results are cached.
+    """
+    key = chain_key(name, prompt, llm, inputs)
+    hit, value = chain_memo.get(name, key)
+    if hit:
+        # Callers fill in defaults on the returned dict; never hand out the cached object itself
+        return copy.deepcopy(value)
+    _record_usage(prompt, inputs)
+    result = (prompt | llm | parser).invoke(inputs)
+    chain_memo.set(name, key, copy.deepcopy(result))
+    return result
+
+
+def llm_cache_stats() -> Dict[str, Dict[str, Any]]:
+    return chain_memo.stats()
+
+
+def invoke_prompt(prompt, llm, **values: Any) -> Any:
+    """invoke_chain for a registered CompiledPrompt: budgets are applied before the inputs are keyed."""
+    return invoke_chain(prompt.name, prompt.template, llm, prompt.parser, prompt.inputs(**values))
+
+
+async def ainvoke_chain(name: str, prompt, llm, parser, inputs: Dict[str, Any]) -> Any:
+    """Async invoke_chain: the model call awaits on the client's async transport instead of blocking the loop."""
+    key = chain_key(name, prompt, llm, inputs)
+    hit, value = chain_memo.get(name, key)
+    if hit:
+        return copy.deepcopy(value)
+    _record_usage(prompt, inputs)
+    result = await (prompt | llm | parser).ainvoke(inputs)
+    chain_memo.set(name, key, copy.deepcopy(result))
+    return result
+
+
+async def ainvoke_prompt(prompt, llm, **values: Any) -> Any:
+    return await ainvoke_chain(prompt.name, prompt.template, llm, prompt.parser, prompt.inputs(**values))
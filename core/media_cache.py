@@ -0,0 +1,95 @@
+import asyncio
+import os
+import re
+import tempfile
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_DIR = Path.cwd() / "reels" / ".locks"
+LOCK_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def _lock_name(key: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", key) + ".lock"
+
+
+def _acquire(handle) -> None:
+    if fcntl:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _release(handle) -> None:
+    if fcntl:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def media_lock(key: str) -> Iterator[None]:
+    """
+    Exclusive lock for one cache key (e.g. a reel shortcode), shared across threads,
+    processes and uvicorn workers that use the same reels/ directory.
+    """
+    with open(LOCK_DIR / _lock_name(key), "a+b") as handle:
+        _acquire(handle)
+        try:
+            yield
+        finally:
+            _release(handle)
+
+
+# Coroutines of this process queue on an asyncio.Lock per key, so at most one executor thread per key
+# blocks in flock; the rest of the executor stays free for the lock holder's own to_thread work
+_async_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+@asynccontextmanager
+async def async_media_lock(key: str) -> AsyncIterator[None]:
+    """media_lock for coroutines: waits for the lock in a worker thread instead of blocking the event loop."""
+    local_lock = _async_locks.get(key)
+    if local_lock is None:
+        local_lock = asyncio.Lock()
+        _async_locks[key] = local_lock
+    async with local_lock:
+        with open(LOCK_DIR / _lock_name(key), "a+b") as handle:
+            await asyncio.to_thread(_acquire, handle)
+            try:
+                yield
+            finally:
+                _release(handle)
+
+
+def temp_path_for(target: Union[str, Path]) -> Path:
+    """Reserve a uniquely named file next to target, so a rename onto target stays atomic."""
+    target = Path(target)
+    fd, name = tempfile.mkstemp(prefix=f".tmp_{target.stem}_", suffix=target.suffix, dir=target.parent)
+    os.close(fd)
+    return Path(name)
+
+
+@contextmanager
+def atomic_write_path(target: Union[str, Path]) -> Iterator[Path]:
+    """
+    Yield a temp path to write into; on success it replaces target in one rename, so
+    readers only ever see a missing or a complete file. On failure the temp file is removed.
+    """
+    temp_path = temp_path_for(target)
+    try:
+        yield temp_path
+        os.replace(temp_path, target)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
@@ -0,0 +1,96 @@
+import os
+import re
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Optional
+
+
+@dataclass(frozen=True)
+class MediaCapabilities:
+    ffmpeg: bool
+    ffprobe: bool
+    encoders: FrozenSet[str] = field(default_factory=frozenset)
+    cpu_count: int = 1
+
+
+@dataclass(frozen=True)
+class EncoderSettings:
+    codec: str
+    args: List[str]
+
+
+_capabilities: Optional[MediaCapabilities] = None
+_probe_lock = threading.Lock()
+
+# Preferred H.264-compatible encoders, best quality per bit first
+_VIDEO_ENCODER_PREFERENCE = ["libx264", "libopenh264", "mpeg4"]
+# libx264 presets from slowest to fastest that still give acceptable quality for Gemini
+_X264_PRESETS = ["fast", "veryfast", "superfast", "ultrafast"]
+
+
+def _tool_available(name: str) -> bool:
+    try:
+        subprocess.run([name, "-version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+
+def _list_encoders() -> FrozenSet[str]:
+    try:
+        out = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True, text=True,
+        ).stdout
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return frozenset()
+    # Encoder lines look like " V....D libx264              libx264 H.264 / AVC ..."
+    return frozenset(re.findall(r"^\s[VAS][\w.]{5}\s+(\S+)", out, re.MULTILINE))
+
+
+def probe_media_toolchain() -> MediaCapabilities:
+    """Run the (slow, subprocess-based) toolchain probe. Called once at startup."""
+    global _capabilities
+    with _probe_lock:
+        ffmpeg_available = _tool_available("ffmpeg")
+        _capabilities = MediaCapabilities(
+            ffmpeg=ffmpeg_available,
+            ffprobe=_tool_available("ffprobe"),
+            encoders=_list_encoders() if ffmpeg_available else frozenset(),
+            cpu_count=os.cpu_count() or 1,
+        )
+        return _capabilities
+
+
+def get_media_capabilities() -> MediaCapabilities:
+    """Cached capability set; probes lazily if startup didn't."""
+    return _capabilities or probe_media_toolchain()
+
+
+def select_video_encoder(duration: Optional[float], load: float, aggressive: bool = False) -> Optional[EncoderSettings]:
+    """
+    Pick the fastest acceptable encoder settings for a reel.
+
+    Longer reels and a busier encoder pool (load in [0, 1]) step libx264 towards faster presets;
+    `aggressive` is the second, smaller pass used when the first output is still too large.
+    Returns None when no usable video encoder is available.
+    """
+    capabilities = get_media_capabilities()
+    codec = next((name for name in _VIDEO_ENCODER_PREFERENCE if name in capabilities.encoders), None)
+    if codec is None:
+        return None
+
+    crf, maxrate, bufsize = ("32", "800k", "1600k") if aggressive else ("28", "1M", "2M")
+    if codec == "libx264":
+        step = 0
+        if duration and duration > 90:
+            step += 1
+        if duration and duration > 300:
+            step += 1
+        if load >= 0.5:
+            step += 1
+        preset = _X264_PRESETS[min(step, len(_X264_PRESETS) - 1)]
+        return EncoderSettings(codec, ["-c:v", codec, "-preset", preset, "-crf", crf, "-maxrate", maxrate, "-bufsize", bufsize])
+    # Encoders without CRF/presets are rate controlled by bitrate alone
+    return EncoderSettings(codec, ["-c:v", codec, "-b:v", maxrate, "-maxrate", maxrate, "-bufsize", bufsize])
@@ -0,0 +1,134 @@
+import asyncio
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from core.audio import SAMPLE_RATE
+from core.config import settings
+
+OVERLAP_SECONDS = 2.0
+MAX_OVERLAP_WORDS = 12
+
+# One pool for every model: per-model pools would each claim all the cores the split is meant to share
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_worker_models: Dict[str, Any] = {}
+
+
+def _init_worker(model_name: str, threads: int) -> None:
+    # Runs once per pool process: split the cores between workers and preload the first requested model
+    import torch
+    torch.set_num_threads(threads)
+    _worker_model(model_name)
+
+
+def _worker_model(model_name: str):
+    """This pool process's Whisper model for `model_name`, loaded on first use."""
+    if model_name not in _worker_models:
+        from core.transcription_service import load_whisper_model
+        _worker_models[model_name] = load_whisper_model(model_name)
+    return _worker_models[model_name]
+
+
+def _transcribe_chunk(samples: np.ndarray, task: str, model_name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    result = _worker_model(model_name).transcribe(samples, task=task, **options)
+    return {
+        "text": result["text"],
+        "segments": [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in result["segments"]],
+    }
+
+
+def get_pool(model_name: str) -> ProcessPoolExecutor:
+    """The process-wide transcription pool; `model_name` is preloaded if this call creates it."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = settings.TRANSCRIPTION_WORKERS
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                # spawn, not fork: forking a process that already runs torch threads can deadlock
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_name, max(1, (os.cpu_count() or 1) // workers)),
+            )
+        return _pool
+
+
+def plan_chunks(n_samples: int, boundaries: List[int], target_seconds: float) -> List[Tuple[int, int]]:
+    """
+    Split [0, n_samples) into chunks of roughly `target_seconds`, cutting at the silence
+    `boundaries` (sample offsets) closest to each target. Stretches with no boundary within
+    1.5 targets are cut hard with OVERLAP_SECONDS of overlap, deduplicated when merging.
+    """
+    target = int(target_seconds * SAMPLE_RATE)
+    overlap = int(OVERLAP_SECONDS * SAMPLE_RATE)
+    chunks = []
+    start = 0
+    while n_samples - start > target * 1.5:
+        candidates = [b for b in boundaries if start + target // 2 < b <= start + target * 1.5]
+        if candidates:
+            cut = min(candidates, key=lambda b: abs(b - (start + target)))
+            chunks.append((start, cut))
+            start = cut
+        else:
+            chunks.append((start, start + target + overlap))
+            start += target
+    chunks.append((start, n_samples))
+    return chunks
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[\w']+", text.lower())
+
+
+def _overlap_words(previous: str, current: str) -> int:
+    """Number of leading words of `current` that repeat the tail of `previous`."""
+    prev_words, cur_words = _words(previous), _words(current)
+    for size in range(min(MAX_OVERLAP_WORDS, len(prev_words), len(cur_words)), 0, -1):
+        if prev_words[-size:] == cur_words[:size]:
+            return size
+    return 0
+
+
+def _drop_leading_words(text: str, count: int) -> str:
+    matches = list(re.finditer(r"[\w']+", text))
+    if count <= 0 or not matches:
+        return text
+    return text[matches[min(count, len(matches)) - 1].end():].lstrip(" ,.")
+
+
+def merge_chunk_results(chunks: List[Tuple[int, int]], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Concatenate chunk transcripts in order, shifting timestamps and removing overlap repeats."""
+    segments: List[Dict[str, Any]] = []
+    previous_end: Optional[int] = None
+    for (start, end), result in zip(chunks, results):
+        offset = start / SAMPLE_RATE
+        chunk_segments = [dict(segment) for segment in result["segments"]]
+        if previous_end is not None and start < previous_end and segments and chunk_segments:
+            tail = " ".join(segment["text"] for segment in segments[-3:])
+            repeated = _overlap_words(tail, chunk_segments[0]["text"])
+            if repeated:
+                chunk_segments[0]["text"] = " " + _drop_leading_words(chunk_segments[0]["text"], repeated)
+        for segment in chunk_segments:
+            segment["start"] += offset
+            segment["end"] += offset
+            if segment["text"].strip():
+                segments.append(segment)
+        previous_end = end
+    return {"text": "".join(segment["text"] for segment in segments), "segments": segments}
+
+
+async def transcribe_parallel(samples: np.ndarray, boundaries: List[int], task: str,
+                              model_name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Transcribe chunks of a long recording concurrently on the model-preloaded process pool."""
+    chunks = plan_chunks(len(samples), boundaries, settings.PARALLEL_CHUNK_SECONDS)
+    pool = get_pool(model_name)
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(pool, _transcribe_chunk, samples[start:end], task, model_name, options)
+        for start, end in chunks
+    ))
+    return merge_chunk_results(chunks, results)
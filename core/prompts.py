@@ -0,0 +1,69 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from langchain_core.prompts import ChatPromptTemplate
+
+# Gemini averages ~4 characters per token on English text; close enough for budgeting without a tokenizer call
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = "\n[... truncated ...]\n"
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to roughly `max_tokens`, keeping the start and the end (2:1) around a marker."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    keep = max(max_chars - len(TRUNCATION_MARKER), 0)
+    head = keep * 2 // 3
+    return text[:head] + TRUNCATION_MARKER + text[len(text) - (keep - head):]
+
+
+@dataclass
+class CompiledPrompt:
+    """A chat template built once, with its parser's format instructions pre-bound and per-input token budgets."""
+    name: str
+    template: ChatPromptTemplate
+    parser: Any = None
+    budgets: Dict[str, int] = field(default_factory=dict)
+    truncations: int = 0
+
+    def inputs(self, **values: Any) -> Dict[str, Any]:
+        """Template variables with every budgeted input stringified and cut to its budget."""
+        for name, budget in self.budgets.items():
+            if name in values:
+                text = values[name] if isinstance(values[name], str) else str(values[name])
+                values[name] = truncate_to_tokens(text, budget)
+                if values[name] is not text:
+                    self.truncations += 1
+        return values
+
+    def render(self, **values: Any) -> str:
+        """The prompt as a single string, for callers that build their own multimodal message."""
+        return self.template.format_messages(**self.inputs(**values))[0].content
+
+
+PROMPTS: Dict[str, CompiledPrompt] = {}
+
+
+def compile_prompt(name: str, text: str, parser: Any = None, budgets: Optional[Dict[str, int]] = None) -> CompiledPrompt:
+    """
+    Build and register a prompt. `text` is a template: every dynamic value (transcripts, claims,
+    evidence) must be a {variable}, never spliced into the text, so braces in it can't break formatting.
+    """
+    template = ChatPromptTemplate.from_template(text)
+    if parser is not None and "format_instructions" in template.input_variables:
+        template = template.partial(format_instructions=parser.get_format_instructions())
+    prompt = CompiledPrompt(name, template, parser, budgets or {})
+    PROMPTS[name] = prompt
+    return prompt
+
+
+def prompt_stats() -> Dict[str, Dict[str, Any]]:
+    return {
+        name: {"template_tokens": estimate_tokens(prompt.template.messages[0].prompt.template),
+               "budgets": prompt.budgets, "truncations": prompt.truncations}
+        for name, prompt in PROMPTS.items()
+    }
@@ -0,0 +1,216 @@
+import json
+import re
+import threading
+import typing
+from typing import Any, Dict, List, Optional
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import JsonOutputParser
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL)
+
+
+class IncrementalJSONParser:
+    """
+    Feed model output as it arrives; `value()` returns the JSON document seen so far, closing any
+    string, array or object the text was cut off inside. Leading prose and code fences are skipped.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+        self._done = False
+        # Buffer length at the last point where the document could be closed cleanly
+        self._safe_end = 0
+
+    def feed(self, chunk: str) -> None:
+        for char in chunk:
+            if self._done:
+                return
+            if not self._started:
+                if char not in "{[":
+                    continue
+                self._started = True
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._mark_safe()
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append("}" if char == "{" else "]")
+                self._mark_safe()
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                self._mark_safe()
+                if not self._stack:
+                    self._done = True
+
+    def _mark_safe(self) -> None:
+        self._safe_end = len(self._buffer)
+
+    @property
+    def complete(self) -> bool:
+        return self._done
+
+    def value(self) -> Optional[Any]:
+        """Best-effort parse of everything fed so far, or None if nothing usable has arrived."""
+        if not self._started:
+            return None
+        text = "".join(self._buffer)
+        if self._done:
+            return json.loads(text)
+        # Try the text as-is (closing a cut-off string), then fall back to the last clean boundary
+        candidates = [text + '"' if self._in_string else text, text[:self._safe_end]]
+        for candidate in candidates:
+            candidate = _trim_incomplete(candidate)
+            try:
+                return json.loads(candidate + "".join(reversed(_open_containers(candidate))))
+            except ValueError:
+                continue
+        return None
+
+
+def _trim_incomplete(text: str) -> str:
+    """Drop a trailing comma, colon or value-less object key, none of which can be closed."""
+    while True:
+        text = text.rstrip()
+        if text.endswith((",", ":")):
+            text = text[:-1]
+            continue
+        stack = _open_containers(text)
+        key = re.search(r'(?<=[{,])\s*"(?:[^"\\]|\\.)*"$', text)
+        if key and stack and stack[-1] == "}":
+            text = text[:key.start()]
+            continue
+        return text
+
+
+def _open_containers(text: str) -> List[str]:
+    """Closers still owed by `text`, innermost last."""
+    stack: List[str] = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    return stack
+
+
+def repair_json(text: str) -> Optional[Any]:
+    """Parse a model response that should be JSON: strict first, then fenced, then repaired if truncated."""
+    if text is None:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    fenced = _FENCE.search(text)
+    parser = IncrementalJSONParser()
+    parser.feed(fenced.group(1) if fenced else text)
+    try:
+        return parser.value()
+    except ValueError:
+        return None
+
+
+_outcomes: Dict[str, Dict[str, int]] = {}
+_outcomes_lock = threading.Lock()
+
+
+def record_parse(label: str, outcome: str) -> None:
+    """`outcome` is "clean", "repaired" or "failed"; a failed parse is a wasted LLM call."""
+    with _outcomes_lock:
+        counts = _outcomes.setdefault(label, {"clean": 0, "repaired": 0, "failed": 0})
+        counts[outcome] += 1
+
+
+def structured_output_stats() -> Dict[str, Dict[str, Any]]:
+    with _outcomes_lock:
+        report = {}
+        for label, counts in _outcomes.items():
+            total = sum(counts.values())
+            report[label] = {**counts, "wasted_call_rate": round(counts["failed"] / total, 3) if total else 0.0}
+        return report
+
+
+def _model_class(annotation: Any) -> Optional[type]:
+    return annotation if isinstance(annotation, type) and hasattr(annotation, "model_fields") else None
+
+
+def missing_fields(value: Any, model: type, path: str = "") -> List[str]:
+    """
+    Required fields of pydantic `model` absent from `value`, recursing into nested models and lists
+    of them. Fields with a default or that accept None may be left out.
+    """
+    if not isinstance(value, dict):
+        return [path or "<root>"]
+    missing = []
+    for name, field in model.model_fields.items():
+        nullable = type(None) in typing.get_args(field.annotation)
+        if name not in value:
+            if field.is_required() and not nullable:
+                missing.append(path + name)
+            continue
+        nested = _model_class(field.annotation)
+        if nested is not None and value[name] is not None:
+            missing += missing_fields(value[name], nested, f"{path}{name}.")
+        element = _model_class(next(iter(typing.get_args(field.annotation)), None))
+        if typing.get_origin(field.annotation) is list and element is not None and isinstance(value[name], list):
+            for index, item in enumerate(value[name]):
+                missing += missing_fields(item, element, f"{path}{name}[{index}].")
+    return missing
+
+
+class TolerantJsonOutputParser(JsonOutputParser):
+    """
+    JsonOutputParser that repairs truncated or wrapped output instead of raising, and records outcomes.
+    Output missing a required field of `pydantic_object` (or a key in `required`) is a failed parse:
+    a repaired fragment of a cut-off reply must not pass for a whole answer.
+    """
+
+    label: str = "default"
+    required: List[str] = []
+
+    def _incomplete(self, value: Any) -> List[str]:
+        if self.pydantic_object is not None and _model_class(self.pydantic_object) is not None:
+            return missing_fields(value, self.pydantic_object)
+        if self.required:
+            return [key for key in self.required if not isinstance(value, dict) or key not in value]
+        return []
+
+    def parse_result(self, result, *, partial: bool = False) -> Any:
+        if partial:
+            return super().parse_result(result, partial=True)
+        text = result[0].text
+        try:
+            value = json.loads(text)
+            outcome = "clean"
+        except ValueError:
+            value = repair_json(text)
+            outcome = "repaired"
+        missing = self._incomplete(value) if value is not None else ["<root>"]
+        if missing:
+            record_parse(self.label, "failed")
+            raise OutputParserException(f"Incomplete JSON output (missing {', '.join(missing[:5])}): {text[:200]}", llm_output=text)
+        record_parse(self.label, outcome)
+        return value
@@ -0,0 +1,129 @@
+import asyncio
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Union
+from core.config import settings
+from core.media_toolchain import get_media_capabilities
+
+ProgressCallback = Callable[[float], Awaitable[None]]
+
+
+class TranscodeError(Exception):
+    """ffmpeg exited with a non-zero status or exceeded its timeout."""
+
+
+class ThreadBudget:
+    """
+    Process-wide pool of encoder threads. Each job borrows threads for its lifetime so
+    concurrent encodes never ask for more cores than the budget allows.
+    """
+
+    def __init__(self, total: int):
+        self.total = max(1, total)
+        self.available = self.total
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def condition(self) -> asyncio.Condition:
+        # Created lazily so it binds to the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @property
+    def load(self) -> float:
+        """Fraction of the budget currently held by running encodes."""
+        return 1 - self.available / self.total
+
+    async def acquire(self, threads: int) -> int:
+        threads = max(1, min(threads, self.total))
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.available >= threads)
+            self.available -= threads
+        return threads
+
+    async def release(self, threads: int) -> None:
+        async with self.condition:
+            self.available += threads
+            self.condition.notify_all()
+
+
+thread_budget = ThreadBudget(settings.FFMPEG_THREAD_BUDGET)
+
+
+async def probe_duration(path: Union[str, Path]) -> Optional[float]:
+    """Media duration in seconds via ffprobe, or None if it can't be determined."""
+    if not get_media_capabilities().ffprobe:
+        return None
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffprobe", "-v", "error", "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1", str(path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        out, _ = await proc.communicate()
+        return float(out.decode().strip())
+    except (OSError, ValueError):
+        return None
+
+
+async def _read_progress(stream: asyncio.StreamReader, duration: Optional[float],
+                         on_progress: Optional[ProgressCallback]) -> None:
+    """Parse ffmpeg's -progress key=value stream into percent-complete callbacks."""
+    last_percent = -1.0
+    while True:
+        line = await stream.readline()
+        if not line:
+            return
+        key, _, value = line.decode(errors="ignore").strip().partition("=")
+        if not on_progress:
+            continue
+        percent = None
+        if key == "out_time_us" and duration and value.isdigit():
+            percent = min(99.0, int(value) / 1_000_000 / duration * 100)
+        elif key == "progress" and value == "end":
+            percent = 100.0
+        if percent is not None and percent - last_percent >= 1.0:
+            last_percent = percent
+            await on_progress(round(percent, 1))
+
+
+async def run_ffmpeg(input_path: Union[str, Path], output_path: Union[str, Path],
+                     output_args: List[str], on_progress: Optional[ProgressCallback] = None,
+                     threads: Optional[int] = None, timeout: Optional[float] = None,
+                     duration: Optional[float] = None) -> None:
+    """
+    Run one ffmpeg job as an asyncio subprocess within the global thread budget.
+
+    Raises TranscodeError on failure or timeout. If the awaiting task is cancelled the
+    ffmpeg process is killed before the cancellation propagates.
+    """
+    timeout = timeout if timeout is not None else settings.FFMPEG_TIMEOUT
+    if on_progress and duration is None:
+        duration = await probe_duration(input_path)
+    granted = await thread_budget.acquire(threads or settings.FFMPEG_JOB_THREADS)
+    proc = None
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-hide_banner", "-nostats", "-loglevel", "error",
+            "-progress", "pipe:1", "-y",
+            "-i", str(input_path), "-threads", str(granted),
+            *output_args, str(output_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        progress_task = asyncio.ensure_future(_read_progress(proc.stdout, duration, on_progress))
+        try:
+            _, stderr = await asyncio.wait_for(
+                asyncio.gather(progress_task, proc.stderr.read()), timeout=timeout
+            )
+            await proc.wait()
+        except asyncio.TimeoutError:
+            raise TranscodeError(f"ffmpeg timed out after {timeout}s")
+        if proc.returncode != 0:
+            raise TranscodeError(stderr.decode(errors="ignore").strip() or f"ffmpeg exited with {proc.returncode}")
+    finally:
+        if proc is not None and proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        await thread_budget.release(granted)
@@ -0,0 +1,70 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import numpy as np
+from core.config import settings
+from core.media_cache import atomic_write_path
+
+TRANSCRIPT_DIR = Path.cwd() / "reels" / "transcripts"
+TRANSCRIPT_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def audio_digest(samples: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(samples, dtype=np.float32).tobytes()).hexdigest()
+
+
+def transcript_key(digest: str, model_name: str, task: str, **options: Any) -> str:
+    """
+    Content address of a transcript: the PCM's `audio_digest` plus the model, task and decoding options.
+    Deployment choices (VAD, batching, worker pools, streaming) don't change what a transcript says,
+    so every flow shares the entry.
+    """
+    key = hashlib.sha256(digest.encode())
+    key.update(json.dumps({"model": model_name, "task": task, **options}, sort_keys=True).encode())
+    return key.hexdigest()
+
+
+class TranscriptCache:
+    """In-memory LRU in front of a JSON-per-transcript disk tier shared by all workers."""
+
+    def __init__(self, directory: Path, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        path = self.directory / f"{key}.json"
+        try:
+            with open(path, "r", encoding="utf-8") as reader:
+                result = json.load(reader)
+        except (OSError, ValueError):
+            return None
+        self._remember(key, result)
+        return result
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        self._remember(key, result)
+        try:
+            with atomic_write_path(self.directory / f"{key}.json") as temp_path:
+                with open(temp_path, "w", encoding="utf-8") as writer:
+                    json.dump(result, writer)
+        except OSError:
+            pass
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+
+transcript_cache = TranscriptCache(TRANSCRIPT_DIR, settings.TRANSCRIPT_CACHE_SIZE)
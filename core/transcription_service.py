@@ -0,0 +1,228 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+import torch
+import whisper
+from core.audio import SAMPLE_RATE
+from core.config import settings
+
+WINDOW_SECONDS = 30  # Whisper's fixed encoder context
+WINDOW_SAMPLES = WINDOW_SECONDS * SAMPLE_RATE
+
+_models: Dict[str, Any] = {}
+_model_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class TranscriptionProfile:
+    name: str
+    model: str
+    beam_size: Optional[int]
+    best_of: Optional[int]
+    temperature: Tuple[float, ...]
+    condition_on_previous_text: bool
+
+    def transcribe_options(self) -> Dict[str, Any]:
+        return {
+            "beam_size": self.beam_size,
+            "best_of": self.best_of,
+            "temperature": self.temperature,
+            "condition_on_previous_text": self.condition_on_previous_text,
+        }
+
+
+# Ordered cheapest first; adaptation steps down this list
+PROFILES: Dict[str, TranscriptionProfile] = {
+    "fast": TranscriptionProfile("fast", "tiny", None, None, (0.0,), False),
+    "balanced": TranscriptionProfile("balanced", "base", None, None, (0.0, 0.4, 0.8), False),
+    "accurate": TranscriptionProfile("accurate", "small", 5, 5, (0.0, 0.2, 0.4, 0.6, 0.8, 1.0), True),
+}
+LONG_REEL_SECONDS = 180
+
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+
+@contextmanager
+def track_transcription() -> Iterator[None]:
+    """Count a transcription as queued/running for the duration of the block."""
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight += 1
+    try:
+        yield
+    finally:
+        with _in_flight_lock:
+            _in_flight -= 1
+
+
+def transcription_queue_depth() -> int:
+    return _in_flight
+
+
+def choose_profile(requested: str, duration_seconds: float, queue_depth: int) -> TranscriptionProfile:
+    """
+    Start from the requested profile and step down one level each for a long reel and for a
+    busy transcription queue, so latency stays bounded under load.
+    """
+    names = list(PROFILES)
+    level = names.index(requested) if requested in PROFILES else names.index("balanced")
+    if duration_seconds > LONG_REEL_SECONDS:
+        level -= 1
+    if queue_depth >= settings.TRANSCRIPTION_BUSY_DEPTH:
+        level -= 1
+    return PROFILES[names[max(level, 0)]]
+
+
+def quantize_whisper_model(model):
+    """
+    Dynamically quantize every linear layer to int8 for CPU inference. Whisper's own Linear
+    subclass isn't recognised by torch's quantizer, so each is first swapped for a plain
+    nn.Linear sharing the same weights.
+    """
+    for parent in list(model.modules()):
+        for child_name, child in parent.named_children():
+            if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+                plain = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+                plain.weight = child.weight
+                plain.bias = child.bias
+                setattr(parent, child_name, plain)
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_whisper_model(name: str, quantize: Optional[bool] = None):
+    """Load a Whisper model, int8-quantized when requested (settings.WHISPER_QUANTIZE) and on CPU."""
+    quantize = settings.WHISPER_QUANTIZE if quantize is None else quantize
+    model = whisper.load_model(name)
+    if quantize and model.device.type == "cpu":
+        model = quantize_whisper_model(model)
+    return model
+
+
+def get_whisper_model(name: str):
+    """Process-wide Whisper model, loaded once per model name."""
+    with _registry_lock:
+        if name not in _models:
+            _models[name] = load_whisper_model(name)
+            _model_locks[name] = threading.Lock()
+        return _models[name]
+
+
+def whisper_model_lock(name: str) -> threading.Lock:
+    """
+    Whisper installs per-call kv-cache hooks on the model, so inference on one shared
+    instance must be serialized.
+    """
+    get_whisper_model(name)
+    return _model_locks[name]
+
+
+def detect_language(samples: np.ndarray, model_name: str) -> str:
+    """Most likely language code of the first 30 s, from a single encoder pass."""
+    model = get_whisper_model(model_name)
+    mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(samples), model.dims.n_mels).to(model.device)
+    with whisper_model_lock(model_name):
+        _, probs = model.detect_language(mel)
+    return max(probs, key=probs.get)
+
+
+class _Job:
+    def __init__(self, n_windows: int):
+        self.future: Future = Future()
+        self.texts: List[Optional[str]] = [None] * n_windows
+        self.remaining = n_windows
+
+    def complete(self, index: int, text: str) -> None:
+        self.texts[index] = text.strip()
+        self.remaining -= 1
+        if self.remaining == 0 and not self.future.done():
+            segments = [
+                {"start": i * WINDOW_SECONDS, "end": (i + 1) * WINDOW_SECONDS, "text": " " + text}
+                for i, text in enumerate(self.texts) if text
+            ]
+            self.future.set_result({"text": " ".join(t for t in self.texts if t), "segments": segments})
+
+    def fail(self, error: Exception) -> None:
+        if not self.future.done():
+            self.future.set_exception(error)
+
+
+class WhisperBatcher:
+    """
+    Collects 30 s audio windows from concurrent requests for up to `window_seconds`, then runs
+    the encoder and decoder over the whole batch in one pass and routes each text back to its caller.
+    """
+
+    def __init__(self, window_seconds: float, max_batch: int):
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Tuple[_Job, int, np.ndarray, Tuple[str, str, Optional[int]]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    def submit(self, samples: np.ndarray, task: str = "translate", model_name: str = "base",
+               beam_size: Optional[int] = None) -> Future:
+        """Queue 16 kHz samples; the future resolves to {"text", "segments"} (segments per 30 s window)."""
+        self._ensure_worker()
+        windows = [samples[i:i + WINDOW_SAMPLES] for i in range(0, len(samples), WINDOW_SAMPLES)]
+        job = _Job(len(windows))
+        if not windows:
+            job.future.set_result({"text": "", "segments": []})
+        for index, window in enumerate(windows):
+            self._queue.put((job, index, window, (model_name, task, beam_size)))
+        return job.future
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="whisper-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window_seconds
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            # One model and DecodingOptions per decode call, so a batch is split by those
+            batch.sort(key=lambda item: (item[3][0], item[3][1], item[3][2] or 0))
+            for settings_key, items in groupby(batch, key=lambda item: item[3]):
+                self._decode(*settings_key, list(items))
+
+    def _decode(self, model_name: str, task: str, beam_size: Optional[int], items: list) -> None:
+        try:
+            model = get_whisper_model(model_name)
+            mel = torch.stack([
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(window), model.dims.n_mels)
+                for _, _, window, _ in items
+            ]).to(model.device)
+            options = whisper.DecodingOptions(
+                task=task, beam_size=beam_size, fp16=model.device.type == "cuda", without_timestamps=True
+            )
+            with whisper_model_lock(model_name):
+                results = whisper.decode(model, mel, options)
+            for (job, index, _, _), result in zip(items, results):
+                job.complete(index, result.text)
+        except Exception as error:
+            for job, _, _, _ in items:
+                job.fail(error)
+
+
+whisper_batcher = WhisperBatcher(settings.WHISPER_BATCH_WINDOW_MS / 1000, settings.WHISPER_MAX_BATCH)
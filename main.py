@@ -6,6 +6,17 @@ from testing_backend.auth import router as auth_router
 from testing_backend.entires import router as entries_router
 from fastapi.middleware.cors import CORSMiddleware
 from websocketbackend.socket import websocket_backend
+from core.media_toolchain import probe_media_toolchain
+from core.llm_cache import llm_cache_stats
+from core.prompts import prompt_stats
+from core.structured_output import structured_output_stats
+from app.steps.substeps.step_6g_hedged_web_verification import hedge_stats
+from core.claim_index import claim_index
+from app.steps.substeps.step_6i_speculative_web_search import speculation_stats
+from core.embedding_models import embedding_model_stats, warm_up_embedding_models
+from core.config import settings
+from core.http_clients import close_async_clients
+import asyncio
 
 app = FastAPI()
 app.add_middleware(
@@ -21,6 +32,25 @@ app.include_router(auth_router, prefix="/api")
 app.include_router(entries_router, prefix="/api")
 
 
+@app.on_event("startup")
+async def probe_media_toolchain_on_startup():
+    # One-time ffmpeg/ffprobe/encoder/core-count probe, reused by every compress_reel call
+    probe_media_toolchain()
+
+
+@app.on_event("startup")
+async def warm_up_embedding_models_on_startup():
+    # Off by default: workers that never reach web search or the claim index never load the model
+    if settings.EMBEDDING_WARMUP:
+        await asyncio.to_thread(warm_up_embedding_models)
+
+
+@app.on_event("shutdown")
+async def close_http_clients_on_shutdown():
+    # Pooled Perplexity / page-fetch clients hold open keep-alive connections
+    await close_async_clients()
+
+
 @app.post("/api/checkAuthenticity")
 async def check_authenticity_endpoint(request_data: dict):
     url = request_data.get("url")
@@ -29,6 +59,48 @@ async def check_authenticity_endpoint(request_data: dict):
     return result
 
 
+@app.get("/api/llmCacheStats")
+async def llm_cache_stats_endpoint():
+    # Per-chain memory/disk hit counts and hit rate of the LLM memoization layer
+    return llm_cache_stats()
+
+
+@app.get("/api/promptStats")
+async def prompt_stats_endpoint():
+    # Template size, input token budgets and truncation count of every registered prompt
+    return prompt_stats()
+
+
+@app.get("/api/structuredOutputStats")
+async def structured_output_stats_endpoint():
+    # Clean / repaired / failed parses per structured prompt; failed ones are wasted LLM calls
+    return structured_output_stats()
+
+
+@app.get("/api/hedgeStats")
+async def hedge_stats_endpoint():
+    # Perplexity hedges launched for web-verified claims and how often they answered first
+    return hedge_stats()
+
+
+@app.get("/api/claimIndexStats")
+async def claim_index_stats_endpoint():
+    # Exact / near-duplicate verdict reuse across reels and claims collapsed within a reel
+    return claim_index.stats()
+
+
+@app.get("/api/speculationStats")
+async def speculation_stats_endpoint():
+    # Speculative web searches used vs made redundant by routing (each still cost a DDGS query), and the latency saved
+    return speculation_stats()
+
+
+@app.get("/api/embeddingModelStats")
+async def embedding_model_stats_endpoint():
+    # Load time and parameter memory of each sentence-embedding model this worker has loaded
+    return embedding_model_stats()
+
+
 @app.websocket("/api/checkAuthenticityWS")
 async def check_authenticity_websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
@@ -1,10 +1,9 @@
 from typing import Dict, List, Any, Optional
 import json
-from langchain_google_genai import ChatGoogleGenerativeAI
+from core.llm import get_llm
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from pydantic import BaseModel, Field
-from core.config import settings
 from src.websearchengine.pipeline import pipeline
 
 
@@ -30,11 +29,7 @@ class OverallVerificationResult(BaseModel):
 def can_verify_with_llm(claim: str) -> Dict[str, Any]:
     """Determine if a claim can be verified using LLM knowledge alone."""
     try:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.1
-        )
+        llm = get_llm(temperature=0.1)
         
         parser = JsonOutputParser()
         
@@ -85,11 +80,7 @@ def can_verify_with_llm(claim: str) -> Dict[str, Any]:
 def verify_claim_with_llm(claim: str, evidence: str) -> Dict[str, Any]:
     """Verify a claim using LLM knowledge alone."""
     try:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.1
-        )
+        llm = get_llm(temperature=0.1)
         
         parser = JsonOutputParser(pydantic_object=ClaimVerificationResult)
         
@@ -176,11 +167,7 @@ def verify_claim_with_web_search(claim: str, evidence: str) -> Dict[str, Any]:
             return create_unverifiable_result(claim, "Web search failed")
         
         # Now use LLM to analyze the web search results
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.1
-        )
+        llm = get_llm(temperature=0.1)
         
         parser = JsonOutputParser(pydantic_object=ClaimVerificationResult)
         
@@ -287,11 +274,7 @@ def verify_individual_claim(claim: Dict[str, Any]) -> Dict[str, Any]:
 def generate_overall_assessment(claim_results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Generate an overall assessment based on individual claim results."""
     try:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=settings.GOOGLE_API_KEY,
-            temperature=0.2
-        )
+        llm = get_llm(temperature=0.2)
         
         parser = JsonOutputParser(pydantic_object=OverallVerificationResult)
         
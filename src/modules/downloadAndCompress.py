@@ -1,8 +1,8 @@
-import subprocess
 import requests
 from pathlib import Path
 from typing import Optional, Dict, Any
 import ffmpeg
+from core.media_toolchain import get_media_capabilities
 
 
 # Ensure reels directory exists
@@ -10,20 +10,6 @@ reels_dir = Path.cwd() / "reels"
 reels_dir.mkdir(parents=True, exist_ok=True)
 
 
-def check_ffmpeg_installation() -> bool:
-    """Function to check if ffmpeg is installed"""
-    try:
-        # Try to get ffmpeg version
-        subprocess.run(["ffmpeg", "-version"], 
-                      stdout=subprocess.DEVNULL, 
-                      stderr=subprocess.DEVNULL, 
-                      check=True)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # print("FFmpeg is not installed or not in PATH. Please install FFmpeg: https://ffmpeg.org/download.html")
-        return False
-
-
 def download_and_compress_video(url: str, filename: str) -> Optional[str]:
     """Main function to download and compress video"""
     try:
@@ -33,7 +19,7 @@ def download_and_compress_video(url: str, filename: str) -> Optional[str]:
         download_reel(url, filename)
         
         # Check if ffmpeg is installed before attempting compression
-        if not check_ffmpeg_installation():
+        if not get_media_capabilities().ffmpeg:
             # print("FFmpeg not found. Skipping compression and returning uncompressed video.")
             return f"/reels/{filename}"
         
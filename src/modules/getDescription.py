@@ -3,11 +3,12 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 from core.config import settings
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+from core.llm import get_llm
 from langchain_core.messages import HumanMessage
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
+from app.steps.substeps.step_4b_upload_video import video_media_part, video_mime_type
 
 
 class VideoClaim(BaseModel):
@@ -59,11 +60,7 @@ def generate_description_from_video(video_url: str, transcript: Optional[str] =
         if not google_api_key:
             raise ValueError("Google API key not configured")
 
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=google_api_key,
-            temperature=0.1,
-        )
+        llm = get_llm(temperature=0.1)
 
         parser = JsonOutputParser(pydantic_object=VideoAnalysis)
 
@@ -102,19 +99,6 @@ Use the transcript below to understand context. Do not include it in your final
             ("human", full_prompt)
         ])
 
-        with open(video_path, 'rb') as video_file:
-            video_buffer = video_file.read()
-
-        file_extension = video_path.suffix.lower()
-        mime_type_map = {
-            ".mp4": "video/mp4",
-            ".webm": "video/webm",
-            ".avi": "video/x-msvideo",
-            ".mov": "video/quicktime",
-            ".mkv": "video/x-matroska",
-        }
-        mime_type = mime_type_map.get(file_extension, "video/mp4")
-
         message = HumanMessage(
             content=[
                 {
@@ -123,11 +107,7 @@ Use the transcript below to understand context. Do not include it in your final
                         format_instructions=parser.get_format_instructions()
                     )[0].content
                 },
-                {
-                    "type": "media",
-                    "mime_type": mime_type,
-                    "data": video_buffer
-                }
+                video_media_part(video_path)
             ]
         )
 
@@ -161,8 +141,8 @@ Use the transcript below to understand context. Do not include it in your final
             "success": True,
             "videoUrl": video_url,
             "analysis": parsed_analysis,
-            "fileSize": f"{len(video_buffer) / (1024 * 1024):.2f} MB",
-            "mimeType": mime_type,
+            "fileSize": f"{video_path.stat().st_size / (1024 * 1024):.2f} MB",
+            "mimeType": video_mime_type(video_path),
         }
 
         if transcript:
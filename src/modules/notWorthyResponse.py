@@ -1,25 +1,35 @@
-from typing import Dict, Any, Union
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
+from typing import Dict, Any, Optional, Union
+from core.structured_output import TolerantJsonOutputParser
+from core.llm import get_llm
+from core.llm_cache import invoke_prompt
+from core.prompts import compile_prompt
 
 
-def analysis_to_text(analysis: Dict[str, Any]) -> str:
+def analysis_to_text(analysis: Union[str, Dict[str, Any]]) -> str:
+    if isinstance(analysis, str):
+        return analysis
     return f"""
     Category: {analysis.get("category")}
-    Core Message: {analysis.get("core_message")}
-    Evidence Used: {analysis.get("evidence_used")}
+    Summary: {analysis.get("summary")}
+    Why Not Worthy: {analysis.get("why_not_worthy")}
     """
 
-def not_worthy_response(description: Union[str, Dict[str, Any]], category: str) -> Dict[str, Any]:
-    try:
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            temperature=0.3
-        )
-        parser = JsonOutputParser()
 
-        prompt = PromptTemplate.from_template("""
+def not_worthy_from_analysis(analysis: Union[str, Dict[str, Any]], category: str) -> Optional[Dict[str, Any]]:
+    """
+    The not-worthy blurb straight from a step 4 VideoAnalysis, which already carries the user-facing
+    summary and reason; None when `analysis` doesn't (free-text descriptions, older analyses).
+    """
+    if not isinstance(analysis, dict):
+        return None
+    summary = analysis.get("short_summary") or analysis.get("summary")
+    reason = analysis.get("why_not_worthy")
+    if not summary or not reason:
+        return None
+    return {"summary": summary, "reason": reason, "category": category}
+
+
+NOT_WORTHY_PROMPT = compile_prompt("not_worthy_response", """
         You are an assistant that helps summarize light or entertaining content that is not worth fact-checking.
 
         Given a detailed video description and its category, generate a clear and short summary of the video meant for end users.
@@ -34,9 +44,18 @@ def not_worthy_response(description: Union[str, Dict[str, Any]], category: str)
 
         Description:
         \"\"\"{description}\"\"\"
-        """)
-        chain = prompt | llm | parser
-        result = chain.invoke({"description": analysis_to_text(description), "category": category})
+        """, TolerantJsonOutputParser(label="not_worthy_response", required=["summary", "reason"]), budgets={"description": 1500})
+
+
+def not_worthy_response(description: Union[str, Dict[str, Any]], category: str) -> Dict[str, Any]:
+    """Summary and reason for a reel that isn't worth fact-checking; an LLM call only for free-text descriptions."""
+    local = not_worthy_from_analysis(description, category)
+    if local is not None:
+        return local
+    try:
+        llm = get_llm(temperature=0.3, json_mode=True)
+
+        result = invoke_prompt(NOT_WORTHY_PROMPT, llm, description=analysis_to_text(description), category=category)
         return result
 
     except Exception as e:
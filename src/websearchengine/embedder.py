@@ -1,7 +1,6 @@
-from sentence_transformers import SentenceTransformer
 from sklearn.neighbors import NearestNeighbors
+from core.embedding_models import get_embedding_model
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
 nn_model = None
 doc_texts = []
 embeddings_cache = None
@@ -13,6 +12,7 @@ def embed_and_search(docs, query):
     if len(doc_texts) == 0:
         return []
     
+    model = get_embedding_model()
     embeddings_cache = model.encode(doc_texts)
     
     nn_model = NearestNeighbors(
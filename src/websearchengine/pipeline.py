@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, Any, List
 from src.websearchengine.search import get_search_results
 from src.websearchengine.queryOptimizer import optimize_query
@@ -9,7 +10,8 @@ async def pipeline(query: str , websocket: WebSocket = None) -> Dict[str, Any]:
         return {"summary": [], "sources": [], "error": "Invalid query"}
     
     optimized_query = optimize_query(query)
-    urls = get_search_results(optimized_query)
+    # DDGS is a blocking client; keep its network wait off the event loop
+    urls = await asyncio.to_thread(get_search_results, optimized_query)
     
     if not urls:
         return {"summary": [], "sources": [], "error": "No search results found"}
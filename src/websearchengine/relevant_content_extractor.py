@@ -1,12 +1,15 @@
 import httpx
 from bs4 import BeautifulSoup
-from sentence_transformers import SentenceTransformer
 from sklearn.neighbors import NearestNeighbors
 import asyncio
 import json
 from fastapi import WebSocket
+from core.embedding_models import get_embedding_model
+from core.http_clients import get_async_client
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+def _client() -> httpx.AsyncClient:
+    # Shared across requests so page fetches reuse pooled keep-alive connections
+    return get_async_client("page_fetch", follow_redirects=True, limits=httpx.Limits(max_connections=50, max_keepalive_connections=20))
 
 def clean_text(html):
     soup = BeautifulSoup(html, 'html.parser')
@@ -26,9 +29,9 @@ async def fetch_url(client, url,websocket:WebSocket=None):
 async def relevant_content_extractor(urls, query, top_k=5,websocket:WebSocket=None):
     """Scrapes URLs concurrently, embeds, and returns relevant content with similarity scores."""
     # 1. Scrape pages concurrently
-    async with httpx.AsyncClient() as client:
-        tasks = [fetch_url(client, url,websocket=websocket) for url in urls]
-        docs = await asyncio.gather(*tasks)
+    client = _client()
+    tasks = [fetch_url(client, url,websocket=websocket) for url in urls]
+    docs = await asyncio.gather(*tasks)
 
     # Filter out failed fetches
     docs = [doc for doc in docs if doc]
@@ -38,7 +41,9 @@ async def relevant_content_extractor(urls, query, top_k=5,websocket:WebSocket=No
 
     # 2. Prepare embeddings
     doc_texts = [doc['text'][:1000] for doc in docs]  
-    embeddings = model.encode(doc_texts, batch_size=8, show_progress_bar=False)
+    # Encoding is CPU-bound; run it in a worker thread so other requests keep being served
+    model = await asyncio.to_thread(get_embedding_model)
+    embeddings = await asyncio.to_thread(model.encode, doc_texts, batch_size=8, show_progress_bar=False)
 
     # 3. Fit Nearest Neighbors
     nn_model = NearestNeighbors(
@@ -48,7 +53,7 @@ async def relevant_content_extractor(urls, query, top_k=5,websocket:WebSocket=No
     nn_model.fit(embeddings)
 
     # 4. Query embedding
-    q_embed = model.encode([query])
+    q_embed = await asyncio.to_thread(model.encode, [query])
     distances, indices = nn_model.kneighbors(q_embed)
 
     # 5. Collect results with scores
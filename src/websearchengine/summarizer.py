@@ -1,23 +1,21 @@
 from typing import List, Union
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from core.config import settings
+from core.llm import get_llm
+from langchain_core.output_parsers import StrOutputParser
+from core.llm_cache import invoke_prompt
+from core.prompts import compile_prompt
 
 
 # Initialize the Gemini model (use gemini-pro for best performance)
-llm = ChatGoogleGenerativeAI(
-    model="gemma-3-12b-it",  # lightweight and fast
-    google_api_key=settings.GOOGLE_API_KEY,
-    temperature=0.5
+llm = get_llm("gemma-3-12b-it", temperature=0.5)  # lightweight and fast
+
+# Scraped pages are the largest prompt input in the pipeline; the budget keeps summarization latency flat
+SUMMARIZE_PROMPT = compile_prompt(
+    "summarize_data",
+    "Summarize the following content based on the query: '{query}'\n\n{context}",
+    StrOutputParser(),
+    budgets={"query": 300, "context": 6000},
 )
 
 def summarize_data(text_blocks: List[str], query: str) -> str:
     context = "\n\n".join(text_blocks)
-
-    prompt_template = ChatPromptTemplate.from_template(
-        "Summarize the following content based on the query: '{query}'\n\n{context}"
-    )
-    
-    chain = prompt_template | llm
-    response = chain.invoke({"query": query, "context": context})
-    return response.content
+    return invoke_prompt(SUMMARIZE_PROMPT, llm, query=query, context=context)
@@ -0,0 +1,33 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+from core.config import settings
+from core.llm_cache import chain_memo
+from app.steps.step_6_if_worthy_response import if_worthy_response
+
+SAMPLE_CLAIMS = [
+    {"claim": "The Great Wall of China is visible from the Moon with the naked eye", "evidence": "Narrator states it over drone footage", "is_worth_verifying": True},
+    {"claim": "Drinking eight glasses of water a day is medically required for adults", "evidence": "On-screen caption", "is_worth_verifying": True},
+    {"claim": "Humans only use 10% of their brains", "evidence": "Speaker says it to the camera", "is_worth_verifying": True},
+    {"claim": "Lightning never strikes the same place twice", "evidence": "Caption during storm footage", "is_worth_verifying": True},
+]
+
+def _uncached():
+    # Benchmarks must count real model requests, not chain memo hits
+    chain_memo.get = lambda name, key: (False, None)
+    chain_memo.set = lambda name, key, value: None
+
+async def benchmark_claim_batching(claims=SAMPLE_CLAIMS):
+    """LLM requests and prompt tokens for one reel's claims: per-claim routing vs one batched request."""
+    for batching in (False, True):
+        settings.CLAIM_BATCHING = batching
+        started = time.perf_counter()
+        result = await if_worthy_response(claims)
+        print(f"batching={batching}: {result['metrics']}, {time.perf_counter() - started:.1f} s")
+
+if __name__ == "__main__":
+    _uncached()
+    asyncio.run(benchmark_claim_batching())
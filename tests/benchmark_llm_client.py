@@ -0,0 +1,24 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from langchain_google_genai import ChatGoogleGenerativeAI
+from core.config import settings
+from core.llm import get_llm
+
+def benchmark_client_setup(iterations: int = 20):
+    """Per-call client setup cost: a fresh ChatGoogleGenerativeAI vs the shared factory."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        ChatGoogleGenerativeAI(model="gemini-2.5-flash", google_api_key=settings.GOOGLE_API_KEY, temperature=0.1)
+    fresh = (time.perf_counter() - started) / iterations
+    get_llm(temperature=0.1)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        get_llm(temperature=0.1)
+    shared = (time.perf_counter() - started) / iterations
+    print(f"fresh client: {fresh * 1000:.2f} ms/call, shared client: {shared * 1000:.4f} ms/call")
+
+if __name__ == "__main__":
+    benchmark_client_setup()
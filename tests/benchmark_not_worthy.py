@@ -0,0 +1,32 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+from src.modules.notWorthyResponse import analysis_to_text, not_worthy_response
+
+SAMPLE_ANALYSIS = {
+    "category": "meme",
+    "claims": [],
+    "summary": "A cat knocks a glass of water off a kitchen counter while its owner watches, set to dramatic music.",
+    "short_summary": "A cat dramatically knocks a glass off the counter.",
+    "is_worthy": False,
+    "why_not_worthy": "It's a comedy clip with no factual claims to check.",
+}
+
+def benchmark_not_worthy(iterations: int = 5):
+    """Latency of the not-worthy branch: a second Gemini round trip vs reading step 4's own fields."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        # A free-text description forces the LLM path; vary it so the chain memo doesn't answer
+        not_worthy_response(analysis_to_text(SAMPLE_ANALYSIS) + f"\n    Run: {time.time()}", "meme")
+    llm_path = (time.perf_counter() - started) / iterations
+    started = time.perf_counter()
+    for _ in range(iterations):
+        not_worthy_response(SAMPLE_ANALYSIS, "meme")
+    local_path = (time.perf_counter() - started) / iterations
+    print(f"LLM round trip: {llm_path * 1000:.1f} ms, from step 4 analysis: {local_path * 1000:.3f} ms, "
+          f"saved per non-worthy reel: {(llm_path - local_path) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    benchmark_not_worthy()
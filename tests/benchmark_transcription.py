@@ -0,0 +1,111 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import io
+import re
+import time
+from pathlib import Path
+import torch
+from core.audio import read_wav, SAMPLE_RATE
+from core.config import settings
+from core.transcription_service import PROFILES, whisper_batcher, load_whisper_model
+from core.transcript_cache import transcript_cache
+from app.steps.step_3_get_audio_transcription import transcribe_speech
+
+def _uncached():
+    # Benchmarks must measure Whisper, not the transcript cache
+    transcript_cache.get = lambda key: None
+    transcript_cache.set = lambda key, result: None
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    ref = re.findall(r"[\w']+", reference.lower())
+    hyp = re.findall(r"[\w']+", hypothesis.lower())
+    distances = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        previous, distances[0] = distances[0], i
+        for j, hyp_word in enumerate(hyp, 1):
+            previous, distances[j] = distances[j], min(
+                distances[j] + 1, distances[j - 1] + 1, previous + (ref_word != hyp_word)
+            )
+    return distances[-1] / max(len(ref), 1)
+
+async def reels_per_minute(samples, concurrency: int) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*(transcribe_speech(samples) for _ in range(concurrency)))
+    return concurrency / (time.perf_counter() - started) * 60
+
+async def benchmark_batching(wav_path: str, cores: int = 4):
+    torch.set_num_threads(cores)
+    samples = read_wav(wav_path)
+    await transcribe_speech(samples)  # warm-up: model load
+    for concurrency in (1, 2, 4, 8):
+        settings.WHISPER_BATCH_WINDOW_MS = 0
+        serial = await reels_per_minute(samples, concurrency)
+        settings.WHISPER_BATCH_WINDOW_MS = 50
+        whisper_batcher.window_seconds = 0.05
+        batched = await reels_per_minute(samples, concurrency)
+        print(f"cores={cores} concurrency={concurrency} serial={serial:.1f} reels/min batched={batched:.1f} reels/min")
+
+async def benchmark_profiles(fixture_dir: str):
+    """Latency and WER per profile over <name>.wav + <name>.txt reference pairs."""
+    fixtures = sorted(Path(fixture_dir).glob("*.wav"))
+    for name in PROFILES:
+        await transcribe_speech(read_wav(fixtures[0]), profile=name)  # warm-up: model load
+        latencies, errors = [], []
+        for wav in fixtures:
+            started = time.perf_counter()
+            result = await transcribe_speech(read_wav(wav), profile=name)
+            latencies.append(time.perf_counter() - started)
+            errors.append(word_error_rate(wav.with_suffix(".txt").read_text(), result["text"]))
+        print(f"profile={name} mean_latency={sum(latencies) / len(latencies):.2f}s mean_wer={sum(errors) / len(errors):.3f}")
+
+async def benchmark_parallel(wav_path: str, workers: int = 4):
+    """Wall-clock speedup of segment-parallel transcription over the serial path on a long reel."""
+    samples = read_wav(wav_path)
+    settings.TRANSCRIPTION_WORKERS = 0
+    started = time.perf_counter()
+    await transcribe_speech(samples)
+    serial = time.perf_counter() - started
+    settings.TRANSCRIPTION_WORKERS = workers
+    settings.PARALLEL_TRANSCRIPTION_SECONDS = 0
+    await transcribe_speech(samples[:SAMPLE_RATE])  # warm-up: start the pool and preload models
+    started = time.perf_counter()
+    await transcribe_speech(samples)
+    parallel = time.perf_counter() - started
+    print(f"workers={workers} serial={serial:.2f}s parallel={parallel:.2f}s speedup={serial / parallel:.2f}x")
+
+def _model_bytes(model) -> int:
+    # Serialized size counts int8 packed weights, which don't show up in model.parameters()
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+def benchmark_quantized(wav_path: str, model_name: str = "base"):
+    """Speed, weight memory and transcript drift of the int8 model against fp32."""
+    samples = read_wav(wav_path)
+    outputs = {}
+    for quantize in (False, True):
+        model = load_whisper_model(model_name, quantize=quantize)
+        model.transcribe(samples[:SAMPLE_RATE * 5], fp16=False)  # warm-up
+        started = time.perf_counter()
+        outputs[quantize] = model.transcribe(samples, fp16=False)["text"]
+        elapsed = time.perf_counter() - started
+        print(f"{'int8' if quantize else 'fp32'}: {elapsed:.2f}s weights={_model_bytes(model) / 1e6:.1f} MB")
+    print(f"int8 vs fp32 WER: {word_error_rate(outputs[False], outputs[True]):.3f}")
+
+if __name__ == "__main__":
+    # python tests/benchmark_transcription.py batching reels/audio/reel_<id>.wav
+    # python tests/benchmark_transcription.py profiles <dir of .wav + reference .txt>
+    # python tests/benchmark_transcription.py parallel <long reel .wav>
+    # python tests/benchmark_transcription.py quantized <reel .wav>
+    _uncached()
+    if sys.argv[1] == "profiles":
+        asyncio.run(benchmark_profiles(sys.argv[2]))
+    elif sys.argv[1] == "parallel":
+        asyncio.run(benchmark_parallel(sys.argv[2]))
+    elif sys.argv[1] == "quantized":
+        benchmark_quantized(sys.argv[2])
+    else:
+        asyncio.run(benchmark_batching(sys.argv[2]))
@@ -0,0 +1,27 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tracemalloc
+from core.config import settings
+from app.steps.step_4_get_video_analysis import generate_description_from_video
+
+def benchmark_video_analysis_modes(video_url: str, transcript: str = None):
+    for mode in ("video", "frames"):
+        result = generate_description_from_video(video_url, transcript, mode=mode)
+        print(mode, result.get("metrics"))
+
+def benchmark_upload_memory(video_url: str, transcript: str = None):
+    """Peak Python heap per request with the video inlined vs referenced through the Files API."""
+    for upload_mode in ("inline", "file_api"):
+        settings.VIDEO_UPLOAD_MODE = upload_mode
+        tracemalloc.start()
+        generate_description_from_video(video_url, transcript, mode="video")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{upload_mode}: peak {peak / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    # e.g. python tests/benchmark_video_analysis.py /reels/video/reel_<id>.mp4
+    benchmark_video_analysis_modes(sys.argv[1])
+    benchmark_upload_memory(sys.argv[1])
@@ -5,6 +5,7 @@ from app.steps.step_3_get_audio_transcription import audio_to_text
 from app.steps.step_4_get_video_analysis import generate_description_from_video
 from src.modules.notWorthyResponse import not_worthy_response
 from app.steps.step_6_if_worthy_response import if_worthy_response
+import asyncio
 import json
 
 async def websocket_backend(websocket: WebSocket, url: str):
@@ -19,7 +20,11 @@ async def websocket_backend(websocket: WebSocket, url: str):
             await websocket.send_text(json.dumps({"step": "success", "message": "Extracted link from url"}))
         
         await websocket.send_text(json.dumps({"step": "processing", "message": "Saving video and audio locally"}))
-        video_and_audio = save_video_and_audio_locally(link['videoUrl'], link['filename']) 
+
+        async def send_compression_progress(percent: float):
+            await websocket.send_text(json.dumps({"step": "progress", "message": "Compressing video", "percent": percent}))
+
+        video_and_audio = await save_video_and_audio_locally(link['videoUrl'], link['filename'], on_progress=send_compression_progress)
         if not video_and_audio.get('success'):
             await websocket.send_text(json.dumps({"step": "error", "message": "Failed to save video and audio locally"}))
             await websocket.close()
@@ -28,13 +33,17 @@ async def websocket_backend(websocket: WebSocket, url: str):
             await websocket.send_text(json.dumps({"step": "success", "message": "Video and audio saved locally"}))
         
         await websocket.send_text(json.dumps({"step": "processing", "message": "Getting audio transcription"}))
-        audio_transcription = audio_to_text(video_and_audio['audio'])
+
+        async def send_transcript_segment(segment: dict):
+            await websocket.send_text(json.dumps({"step": "transcript_segment", "start": segment["start"], "end": segment["end"], "text": segment["text"]}))
+
+        audio_transcription = await audio_to_text(video_and_audio['audio'], on_segment=send_transcript_segment)
         if not audio_transcription:
             await websocket.send_text(json.dumps({"step": "warning", "message": "Failed to get audio transcription, proceeding with video analysis"}))
         await websocket.send_text(json.dumps({"step": "success", "message": "Audio transcription generated"}))
         
         await websocket.send_text(json.dumps({"step": "processing", "message": "Generating video analysis"}))
-        video_analysis = generate_description_from_video(video_and_audio['video'], audio_transcription)
+        video_analysis = await asyncio.to_thread(generate_description_from_video, video_and_audio['video'], audio_transcription)
         if not video_analysis.get('success'):
             await websocket.send_text(json.dumps({"step": "error", "message": "Failed to generate video analysis"}))
             await websocket.close()